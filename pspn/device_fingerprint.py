@@ -8,6 +8,147 @@ from device_info import DeviceInfo, DeviceType
 from ssh_client import SSHClient, SSHClientOptions
 
 
+# Patterns are compiled once at import time instead of on every fingerprint. Patterns for
+# configuration lines and "Key: value" fields are anchored to the start of a line so a
+# match cannot begin mid-line (e.g. in a command echo) or run on into the next line
+_HOSTNAME_RE = {
+    DeviceType.CiscoIOS: re.compile(r'^[ \t]*hostname[ \t]+(\S+)', re.IGNORECASE | re.MULTILINE),
+    # "show hostname" prints the bare name, which is only preceded by the command echo
+    DeviceType.CiscoNXOS: re.compile(r'hostname\s+([^\s\r\n]+)', re.IGNORECASE),
+    DeviceType.CiscoASA: re.compile(r'^[ \t]*hostname[ \t]+(\S+)', re.IGNORECASE | re.MULTILINE),
+    DeviceType.AristaEOS: re.compile(r'hostname\s+([^\s\r\n]+)', re.IGNORECASE),
+    DeviceType.JuniperJunOS: re.compile(r'^[ \t]*host-name[ \t]+([^\s;]+)', re.IGNORECASE | re.MULTILINE),
+    DeviceType.Linux: re.compile(r'Hostname:[^\n]*(\S+)[\r\n]', re.IGNORECASE),
+    DeviceType.GenericUnix: re.compile(r'([A-Za-z0-9\-]+)[@][^:]+:', re.IGNORECASE),
+}
+
+# Characters a line may end with to be accepted as a prompt
+_PROMPT_SUFFIXES = ('#', '>', '$', ':', ']', ')')
+
+# How far back from the end of the buffer to look for the prompt line
+_PROMPT_SCAN_BYTES = 512
+
+_PROMPT_HOSTNAME_RE = re.compile(r'^([A-Za-z0-9\-._]+)(?:[>#]|$)')
+
+_SERIAL_RE = re.compile(r'[Ss]erial\s*[Nn]umber\s*:?\s*([A-Za-z0-9\-]+)', re.IGNORECASE)
+
+# Detail fields as (DeviceInfo attribute, patterns, prefix). Patterns are tried in
+# order and the first match wins; the prefix is prepended to the captured value
+_COMMON_DETAILS = (
+    # Serial number - common pattern across many devices
+    ('serial_number', (_SERIAL_RE,), ""),
+)
+
+_DETAILS_BY_TYPE = {
+    DeviceType.CiscoIOS: (
+        ('version', (re.compile(r'(?:IOS|Software).+?Version\s+([^,\s\r\n]+)', re.IGNORECASE),), ""),
+        ('model', (re.compile(r'[Cc]isco\s+([A-Za-z0-9\-]+)(?:\s+[^\n]*?)(?:processor|chassis|router|switch)',
+                              re.DOTALL),), ""),
+    ),
+    DeviceType.CiscoNXOS: (
+        ('version', (re.compile(r'NXOS:\s+version\s+([^,\s\r\n]+)', re.IGNORECASE),), ""),
+        ('model', (re.compile(r'cisco\s+Nexus\s+([^\s]+)', re.IGNORECASE),), "Nexus "),
+    ),
+    DeviceType.CiscoASA: (
+        ('version', (re.compile(r'Adaptive Security Appliance.*?Version\s+([^,\s\r\n]+)', re.IGNORECASE),), ""),
+        ('model', (re.compile(r'^[ \t]*Hardware:[ \t]+([^,\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+    ),
+    DeviceType.AristaEOS: (
+        ('version', (re.compile(r'EOS\s+version\s+([^,\s\r\n]+)', re.IGNORECASE),), ""),
+        ('model', (re.compile(r'Arista\s+([A-Za-z0-9\-]+)', re.IGNORECASE),), ""),
+    ),
+    DeviceType.JuniperJunOS: (
+        ('version', (re.compile(r'JUNOS\s+([^,\s\r\n\]]+)', re.IGNORECASE),), ""),
+        ('model', (re.compile(r'^[ \t]*Model:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+    ),
+    DeviceType.HPProCurve: (
+        ('version', (re.compile(r'^[ \t]*Software[ \t]+revision[ \t]*:?[ \t]*([^\r\n]+)',
+                                re.IGNORECASE | re.MULTILINE),), ""),
+        ('model', (re.compile(r'[Ss]witch\s+([A-Za-z0-9\-]+)'),), ""),
+    ),
+    DeviceType.FortiOS: (
+        ('version', (re.compile(r'^[ \t]*Version:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+        ('model', (re.compile(r'FortiGate-([A-Za-z0-9\-]+)', re.IGNORECASE),), "FortiGate-"),
+    ),
+    DeviceType.PaloAltoOS: (
+        ('version', (re.compile(r'^[ \t]*sw-version:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+        ('model', (re.compile(r'^[ \t]*model:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+    ),
+    DeviceType.Linux: (
+        # Prefer the distribution name and fall back to uname output
+        ('version', (re.compile(r'^PRETTY_NAME="([^"]+)"', re.IGNORECASE | re.MULTILINE),
+                     re.compile(r'Linux\s+\S+\s+([^\s]+)')), ""),
+        ('cpu_info', (re.compile(r'^model name[ \t]*:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+    ),
+    DeviceType.FreeBSD: (
+        ('version', (re.compile(r'FreeBSD\s+\S+\s+([^\s]+)'),), ""),
+    ),
+    DeviceType.Windows: (
+        ('version', (re.compile(r'^[ \t]*OS Name:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+        ('model', (re.compile(r'^[ \t]*System Model:[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE),), ""),
+    ),
+}
+
+# Vendor detection rules in priority order as (device type, keywords, required, excluded).
+# A rule matches when any of its keywords is present, all required keywords are present
+# and none of the excluded keywords are, so each keyword is scanned for at most once
+_VENDOR_RULES = (
+    # Cisco product family
+    (DeviceType.CiscoIOS, ("cisco ios", "cisco internetwork operating system", "ios-xe"), (), ()),
+    (DeviceType.CiscoNXOS, ("nx-os", "nexus"), (), ()),
+    (DeviceType.CiscoASA, ("adaptive security appliance", "asa"), (), ()),
+    # Arista
+    (DeviceType.AristaEOS, ("arista",), (), ()),
+    (DeviceType.AristaEOS, ("eos",), (), ("cisco",)),
+    # Juniper
+    (DeviceType.JuniperJunOS, ("junos", "juniper"), (), ()),
+    # HPE/Aruba products
+    (DeviceType.HPProCurve, ("hp", "hewlett-packard"), ("procurve",), ()),
+    (DeviceType.HPProCurve, ("aruba",), (), ()),  # Use HPProCurve for Aruba switches
+    # Fortinet
+    (DeviceType.FortiOS, ("fortigate", "fortios"), (), ()),
+    # Palo Alto
+    (DeviceType.PaloAltoOS, ("pan-os", "palo alto"), (), ()),
+    # Generic OS types, only considered once no network vendor matched
+    (DeviceType.Linux, ("linux", "ubuntu", "centos", "debian", "redhat", "fedora"), (), ()),
+    (DeviceType.FreeBSD, ("freebsd",), (), ()),
+    (DeviceType.Windows, ("windows", "microsoft"), (), ()),
+)
+
+# Device types whose interface status output is parsed into DeviceInfo.interfaces
+_NETWORK_DEVICE_TYPES = (DeviceType.CiscoIOS, DeviceType.CiscoNXOS, DeviceType.CiscoASA,
+                         DeviceType.AristaEOS, DeviceType.JuniperJunOS)
+
+# Product model numbers that imply a vendor
+_CISCO_MODEL_NUMBER_RE = re.compile(r'\bws-c\d{4}\b|\bc\d{4}\b')
+_NEXUS_MODEL_NUMBER_RE = re.compile(r'\bn\d{4}\b')
+
+_IP_PATTERN = r'\b(?:\d{1,3}\.){3}\d{1,3}(?:/\d{1,2})?\b'
+_IP_RE = re.compile(_IP_PATTERN)
+
+# Nearby terms that suggest an IP address is a management address
+_IP_CONTEXT_TERMS = ('ip address', 'management', 'vlan', 'interface')
+
+# Interface status lines like "GigabitEthernet0/0 is up, line protocol is up", anchored to
+# the start of the line so "line protocol is up" is not taken for an interface
+_IFACE_STATUS_RE = re.compile(
+    r'^[ \t]*(?P<iface>[A-Za-z0-9/\-\.]+)\s+is\s+(?P<status>up|down|administratively down)',
+    re.MULTILINE
+)
+
+# How long the SSH client waits for the prompt after each command
+_COMMAND_TIMEOUT_MS = 5000
+
+# Once all of these are known the remaining identification commands are skipped
+_REQUIRED_DETAILS = ('hostname', 'version', 'model', 'serial_number')
+
+
+def _decode_from(buffer, start=0):
+    """Decode the bytes of buffer from start onwards, via a view instead of a slice copy"""
+    with memoryview(buffer)[start:] as view:
+        return str(view, 'utf-8', 'replace')
+
+
 class DeviceFingerprint:
     def __init__(self, host, port, username, password, output_callback=None,
                  debug=False, verbose=False, connection_timeout=5000):
@@ -17,9 +158,15 @@ class DeviceFingerprint:
             username=username
         )
         self._device_info.password = password  # Store password for reporting if needed
-        self._output_buffer = []
+        # Session output is accumulated as UTF-8 bytes with a running length so polling
+        # loops never have to rejoin the whole buffer
+        self._output_buffer = bytearray()
+        self._buffer_len = 0
         self._is_connected = False
         self._paging_disabled = False
+        # Commands for the current device type, looked up once each time the type changes
+        self._disable_paging_cmd = ""
+        self._identification_cmds = DeviceType.Unknown.get_identification_commands()
         self._verbose = verbose
         self._debug = debug
         self._connection_timeout = connection_timeout
@@ -37,13 +184,15 @@ class DeviceFingerprint:
             prompt_count=1,
             shell_timeout=2,
             inter_command_time=0,
-            expect_prompt_timeout=5000,
+            expect_prompt_timeout=_COMMAND_TIMEOUT_MS,
             debug=debug
         )
 
         # Set up output capture
         def buffer_callback(output):
-            self._output_buffer.append(output)
+            chunk = output.encode('utf-8') if isinstance(output, str) else output
+            self._output_buffer.extend(chunk)
+            self._buffer_len = len(self._output_buffer)
 
         if output_callback:
             ssh_options.output_callback = lambda output: (
@@ -76,38 +225,31 @@ class DeviceFingerprint:
                     print("Trying to identify device type from initial connection...")
 
                 # Check for device type indicators in the initial output
-                initial_output = ''.join(self._output_buffer)
+                initial_output = _decode_from(self._output_buffer)
                 initial_device_type = self.identify_vendor_from_output(initial_output)
 
                 if initial_device_type != DeviceType.Unknown:
-                    self._device_info.device_type = initial_device_type
+                    self._set_device_type(initial_device_type)
                     if self._debug:
                         print("Initial device type detection: {}".format(initial_device_type.name))
 
-                # Get and apply the disable paging command
-                disable_paging_cmd = self._device_info.device_type.get_disable_paging_command()
-                if disable_paging_cmd:
-                    if self._debug:
-                        print("Disabling paging with command: {}".format(disable_paging_cmd))
-
-                    self._device_info.disable_paging_command = disable_paging_cmd
-                    self.safe_execute_command(disable_paging_cmd)
-                    self._paging_disabled = True
-
-            # Run identification commands based on device type
-            identification_commands = []
-
-            if self._device_info.device_type != DeviceType.Unknown:
-                identification_commands = self._device_info.device_type.get_identification_commands()
-            else:
-                # If device type is unknown, try some generic commands that work on many devices
-                identification_commands = [
-                    "show version",
-                    "show system info",
-                ]
-
-            # Execute identification commands and collect output
-            for cmd in identification_commands:
+                self._disable_paging()
+
+            # Run identification commands based on device type, an unknown device gets
+            # generic commands that work on many devices
+            identification_commands = list(self._identification_cmds)
+
+            # Execute identification commands and collect output, stopping early once the
+            # outputs so far already provide every required detail
+            details_known = 0
+            while identification_commands and details_known < len(_REQUIRED_DETAILS):
+                if self._device_info.device_type != DeviceType.Unknown:
+                    # The remaining commands only gather details, so send them together
+                    outputs = self.safe_execute_commands_batch(identification_commands)
+                    self._device_info.command_outputs.update(zip(identification_commands, outputs))
+                    break
+
+                cmd = identification_commands.pop(0)
                 if self._debug:
                     print("Executing identification command: {}".format(cmd))
 
@@ -120,20 +262,21 @@ class DeviceFingerprint:
                 if self._device_info.device_type == DeviceType.Unknown:
                     detected_type = self.identify_vendor_from_output(output)
                     if detected_type != DeviceType.Unknown:
-                        self._device_info.device_type = detected_type
+                        self._set_device_type(detected_type)
                         if self._debug:
                             print("Detected device type: {}".format(detected_type.name))
 
                         # If we've now identified the device, try to disable paging if not done yet
-                        if not self._paging_disabled:
-                            disable_paging_cmd = self._device_info.device_type.get_disable_paging_command()
-                            if disable_paging_cmd:
-                                if self._debug:
-                                    print("Disabling paging with command: {}".format(disable_paging_cmd))
+                        self._disable_paging()
 
-                                self._device_info.disable_paging_command = disable_paging_cmd
-                                self.safe_execute_command(disable_paging_cmd)
-                                self._paging_disabled = True
+                        # The remaining generic probes are no longer needed, switch to the
+                        # commands specific to the detected device type
+                        identification_commands = [
+                            command for command in self._identification_cmds
+                            if command not in self._device_info.command_outputs
+                        ]
+
+                details_known = self._extract_from(output)
 
             # Extract device details from accumulated output
             self.extract_device_details()
@@ -157,30 +300,45 @@ class DeviceFingerprint:
                 self._ssh_client.disconnect()
                 self._is_connected = False
 
+    def _set_device_type(self, device_type):
+        """Record the device type and look up the commands specific to it"""
+        self._device_info.device_type = device_type
+        self._disable_paging_cmd = device_type.get_disable_paging_command()
+        self._identification_cmds = device_type.get_identification_commands()
+
+    def _disable_paging(self):
+        """Send the disable paging command for the device type, if it has one and it wasn't sent yet"""
+        if self._paging_disabled or not self._disable_paging_cmd:
+            return
+
+        if self._debug:
+            print("Disabling paging with command: {}".format(self._disable_paging_cmd))
+
+        self._device_info.disable_paging_command = self._disable_paging_cmd
+        self.safe_execute_command(self._disable_paging_cmd)
+        self._paging_disabled = True
+
     def detect_prompt(self):
         """Detect the device prompt by sending a newline"""
         if self._debug:
             print("Starting improved prompt detection...")
 
         # First, check the current content of the buffer
-        current_buffer = ''.join(self._output_buffer)
         if self._debug:
-            print("Current buffer length: {} bytes".format(len(current_buffer)))
+            print("Current buffer length: {} bytes".format(self._buffer_len))
 
-        # Look at the last few lines of the existing buffer for a prompt
-        existing_lines = re.split(r'[\r\n]+', current_buffer)
-        existing_lines = [line for line in existing_lines if line.strip()]
+        # Look at the tail of the existing buffer for a prompt rather than splitting the
+        # whole session into lines
+        tail = _decode_from(self._output_buffer, max(0, self._buffer_len - _PROMPT_SCAN_BYTES)).rstrip()
 
-        if existing_lines:
+        if tail:
             # Get the last line which is likely to be a prompt
-            last_line = existing_lines[-1].strip() if existing_lines else ""
+            last_line = tail[max(tail.rfind('\n'), tail.rfind('\r')) + 1:].strip()
             if self._debug:
                 print("Last line from existing buffer: '{}'".format(last_line))
 
             # Check if this looks like a valid prompt
-            if last_line and (last_line.endswith('#') or last_line.endswith('>') or
-                              last_line.endswith('$') or last_line.endswith(':') or
-                              last_line.endswith(']') or last_line.endswith(')')):
+            if last_line and last_line.endswith(_PROMPT_SUFFIXES):
                 if self._debug:
                     print("Detected prompt from existing buffer: '{}'".format(last_line))
 
@@ -190,9 +348,8 @@ class DeviceFingerprint:
                     if self._debug:
                         print("Set expect prompt on SSH client to: '{}'".format(last_line))
                 except Exception as e:
-                    traceback.print_exc()
-
                     if self._debug:
+                        traceback.print_exc()
                         print("Error setting expect prompt: {}".format(str(e)))
 
                 return last_line
@@ -202,7 +359,7 @@ class DeviceFingerprint:
             print("No valid prompt found in buffer, sending newline...")
 
         # Mark the current length so we can extract only new content
-        previous_length = len(''.join(self._output_buffer))
+        previous_length = self._buffer_len
 
         # Send a newline and wait for response
         self._ssh_client.execute_command("\n")
@@ -212,9 +369,8 @@ class DeviceFingerprint:
 
         # Get only the new content received after our command
         new_content = ""
-        current_buffer = ''.join(self._output_buffer)
-        if len(current_buffer) > previous_length:
-            new_content = current_buffer[previous_length:]
+        if self._buffer_len > previous_length:
+            new_content = _decode_from(self._output_buffer, previous_length)
             if self._debug:
                 print("New content after newline ({} bytes): '{}'".format(len(new_content), new_content))
         else:
@@ -222,8 +378,7 @@ class DeviceFingerprint:
                 print("No new content received after newline command")
 
         # Parse the new content for a prompt
-        new_lines = re.split(r'[\r\n]+', new_content)
-        new_lines = [line for line in new_lines if line.strip()]
+        new_lines = [line for line in new_content.splitlines() if line.strip()]
         prompt_line = new_lines[-1].strip() if new_lines else ""
 
         if prompt_line:
@@ -236,8 +391,8 @@ class DeviceFingerprint:
                 if self._debug:
                     print("Set expect prompt on SSH client to: '{}'".format(prompt_line))
             except Exception as e:
-                traceback.print_exc()
                 if self._debug:
+                    traceback.print_exc()
                     print("Error setting expect prompt: {}".format(str(e)))
 
             return prompt_line
@@ -245,7 +400,7 @@ class DeviceFingerprint:
         # If still not successful, try a different approach - send a harmless command
         if self._debug:
             print("Trying with a harmless command...")
-        previous_length = len(''.join(self._output_buffer))
+        previous_length = self._buffer_len
 
         # Send a harmless command that works on most devices
         self._ssh_client.execute_command("?")
@@ -253,15 +408,13 @@ class DeviceFingerprint:
         # Give it time to receive the response
         time.sleep(1)
 
-        current_buffer = ''.join(self._output_buffer)
-        if len(current_buffer) > previous_length:
-            new_content = current_buffer[previous_length:]
+        if self._buffer_len > previous_length:
+            new_content = _decode_from(self._output_buffer, previous_length)
             if self._debug:
                 print("New content after ? command ({} bytes): '{}'".format(len(new_content), new_content))
 
             # Get the last line which should include the prompt
-            new_lines = re.split(r'[\r\n]+', new_content)
-            new_lines = [line for line in new_lines if line.strip()]
+            new_lines = [line for line in new_content.splitlines() if line.strip()]
             prompt_line = new_lines[-1].strip() if new_lines else ""
 
             if prompt_line:
@@ -274,9 +427,8 @@ class DeviceFingerprint:
                     if self._debug:
                         print("Set expect prompt on SSH client to: '{}'".format(prompt_line))
                 except Exception as e:
-                    traceback.print_exc()
-
                     if self._debug:
+                        traceback.print_exc()
                         print("Error setting expect prompt: {}".format(str(e)))
 
                 return prompt_line
@@ -286,77 +438,35 @@ class DeviceFingerprint:
             print("Failed to detect prompt through all methods, using default pattern")
         return "[#>$]"
 
-    def safe_execute_command(self, command, timeout_ms=3000, retries=1):
-        """Execute command safely with timeout and retry logic"""
+    def safe_execute_command(self, command, timeout_ms=None, retries=1, prompt_count=1):
+        """Execute command safely with timeout and retry logic, waiting for prompt_count prompts"""
         for attempt in range(retries + 1):
             try:
                 # Record the current buffer length to track only new output
-                start_position = len(''.join(self._output_buffer))
+                start_position = self._buffer_len
 
                 if self._debug:
                     print("Executing command (attempt {}/{}): '{}'".format(attempt + 1, retries + 1, command))
                     print("Buffer position before command: {}".format(start_position))
 
-                # Execute the command
-                self._ssh_client.execute_command(command)
-
-                # Wait for initial response
-                time.sleep(0.3)
-
-                # Get current position
-                current_buffer = ''.join(self._output_buffer)
-                current_position = len(current_buffer)
-                if self._debug:
-                    print("Buffer position after initial wait: {}".format(current_position))
-
-                # Only wait longer if we need to - up to max timeout
-                start_time = time.time()
-                end_time = start_time + (timeout_ms / 1000)
-
-                # Track buffer changes
-                last_known_length = current_position
-                last_change_time = time.time()
-
-                while time.time() < end_time:
-                    # Check if buffer has changed
-                    current_buffer = ''.join(self._output_buffer)
-                    current_position = len(current_buffer)
-
-                    if current_position > last_known_length:
-                        # Buffer has grown, update last change time
-                        last_known_length = current_position
-                        last_change_time = time.time()
-                    elif (time.time() - last_change_time > 0.3 and
-                          time.time() - start_time > 0.5):
-                        # Buffer hasn't changed for 300ms and we've waited at least 500ms total
-                        if self._debug:
-                            print("Command appears complete (no buffer change)")
-                        break
-
-                    # Check if output ends with the prompt (if we know it)
-                    if self._device_info.detected_prompt:
-                        if current_buffer.rstrip().endswith(self._device_info.detected_prompt):
-                            if self._debug:
-                                print("Command appears complete (prompt detected)")
-                            break
-
-                    # Short sleep to prevent CPU spinning
-                    time.sleep(0.05)
+                # Execute the command. The SSH client reads the whole response, up to its
+                # expect prompt or timeout, and has passed it all to the output callback by
+                # the time it returns, so there is nothing left to wait for
+                self._ssh_client.execute_command(
+                    command, expect_prompt_count=prompt_count, expect_prompt_timeout=timeout_ms)
 
                 # Extract only the new output
                 result = ""
-                current_buffer = ''.join(self._output_buffer)
-                if len(current_buffer) > start_position:
-                    result = current_buffer[start_position:]
+                if self._buffer_len > start_position:
+                    result = _decode_from(self._output_buffer, start_position)
 
                 if self._debug:
                     print("Command complete, received {} bytes of output".format(len(result)))
                 return result
 
             except Exception as e:
-                traceback.print_exc()
-
                 if self._debug:
+                    traceback.print_exc()
                     print("Error executing command: {}".format(str(e)))
 
                 # If we've reached the maximum number of retries, return the error
@@ -375,277 +485,141 @@ class DeviceFingerprint:
                         time.sleep(1)
                         self._ssh_client.connect()
                     except Exception as reconnect_ex:
-                        traceback.print_exc()
-
                         if self._debug:
+                            traceback.print_exc()
                             print("Reconnection attempt failed: {}".format(str(reconnect_ex)))
 
         return "ERROR: Max retries exceeded"
 
+    def safe_execute_commands_batch(self, commands, timeout_ms=None, retries=1):
+        """Execute several commands in a single round trip and return their outputs"""
+        # Paging would stall a batch part way through, the output can only be split on a
+        # known prompt and the SSH client uses commas to separate commands, so fall back
+        # to one command at a time
+        prompt = self._device_info.detected_prompt
+        if (len(commands) < 2 or not self._paging_disabled or not prompt or
+                any(',' in cmd for cmd in commands)):
+            return [self.safe_execute_command(cmd, timeout_ms, retries) for cmd in commands]
+
+        if self._debug:
+            print("Executing batched commands: {}".format(commands))
+
+        # Give the batch the time each command would have had on its own, and wait for
+        # the prompt that follows every one of them
+        batch_timeout_ms = (timeout_ms or _COMMAND_TIMEOUT_MS) * len(commands)
+        output = self.safe_execute_command(",".join(commands), batch_timeout_ms, retries, len(commands))
+
+        # Each command's output runs up to and including the prompt that follows it
+        outputs = []
+        start = 0
+        end = output.find(prompt)
+        while end != -1:
+            end += len(prompt)
+            outputs.append(output[start:end])
+            start = end
+            end = output.find(prompt, start)
+
+        # A prompt showing up inside some output, or a missing one, makes the split
+        # unreliable, so run the commands again one at a time
+        if len(outputs) != len(commands) or output[start:].strip():
+            if self._debug:
+                print("Batched output has {} prompts for {} commands, running them serially".format(
+                    len(outputs), len(commands)))
+            return [self.safe_execute_command(cmd, timeout_ms, retries) for cmd in commands]
+
+        return outputs
+
     def identify_vendor_from_output(self, output):
         """Identify device type from command output"""
         lower_output = output.lower()
 
-        # Identify based on explicit vendor/OS mentions
-        # Cisco product family
-        if "cisco ios" in lower_output or "cisco internetwork operating system" in lower_output:
-            return DeviceType.CiscoIOS
+        # Identify based on explicit vendor and OS mentions
+        for device_type, keywords, required, excluded in _VENDOR_RULES:
+            if (any(keyword in lower_output for keyword in keywords) and
+                    all(keyword in lower_output for keyword in required) and
+                    not any(keyword in lower_output for keyword in excluded)):
+                return device_type
 
-        if "ios-xe" in lower_output:
+        # Identify based on product model mentions that imply vendor
+        if _CISCO_MODEL_NUMBER_RE.search(lower_output):
             return DeviceType.CiscoIOS
 
-        if "nx-os" in lower_output or "nexus" in lower_output:
+        if _NEXUS_MODEL_NUMBER_RE.search(lower_output):
             return DeviceType.CiscoNXOS
 
-        if "adaptive security appliance" in lower_output or "asa" in lower_output:
-            return DeviceType.CiscoASA
-
-        # Arista
-        if "arista" in lower_output or ("eos" in lower_output and "cisco" not in lower_output):
-            return DeviceType.AristaEOS
-
-        # Juniper
-        if "junos" in lower_output or "juniper" in lower_output:
-            return DeviceType.JuniperJunOS
-
-        # HPE/Aruba products
-        if ("hp" in lower_output or "hewlett-packard" in lower_output) and "procurve" in lower_output:
-            return DeviceType.HPProCurve
-
-        if "aruba" in lower_output:
-            return DeviceType.HPProCurve  # Use HPProCurve for Aruba switches
-
-        # Fortinet
-        if "fortigate" in lower_output or "fortios" in lower_output:
-            return DeviceType.FortiOS
-
-        # Palo Alto
-        if "pan-os" in lower_output or "palo alto" in lower_output:
-            return DeviceType.PaloAltoOS
-
-        # Generic OS types
-        if any(os in lower_output for os in ["linux", "ubuntu", "centos", "debian", "redhat", "fedora"]):
-            return DeviceType.Linux
-
-        if "freebsd" in lower_output:
-            return DeviceType.FreeBSD
-
-        if "windows" in lower_output or "microsoft" in lower_output:
-            return DeviceType.Windows
+        return DeviceType.Unknown
 
-        # Identify based on product model mentions that imply vendor
-        if re.search(r'\bws-c\d{4}\b', lower_output) or re.search(r'\bc\d{4}\b', lower_output):
-            return DeviceType.CiscoIOS
+    def _extract_from(self, output):
+        """Fill in the details still missing from output, return how many required ones are known"""
+        # Extract hostname
+        device_type = self._device_info.device_type
+        if not self._device_info.hostname and device_type in _HOSTNAME_RE:
+            match = _HOSTNAME_RE[device_type].search(output)
+            if match and match.group(1):
+                self._device_info.hostname = match.group(1)
 
-        if re.search(r'\bn\d{4}\b', lower_output) or "nexus" in lower_output:
-            return DeviceType.CiscoNXOS
+        # Extract serial number and the details specific to the device type, skipping
+        # any field that is already known
+        for field, patterns, prefix in _COMMON_DETAILS + _DETAILS_BY_TYPE.get(device_type, ()):
+            if getattr(self._device_info, field):
+                continue
+            for pattern in patterns:
+                match = pattern.search(output)
+                if match and match.group(1):
+                    setattr(self._device_info, field, prefix + match.group(1).strip())
+                    break
 
-        return DeviceType.Unknown
+        return sum(1 for field in _REQUIRED_DETAILS if getattr(self._device_info, field))
 
     def extract_device_details(self):
         """Extract detailed information from command outputs"""
         # Get the full output buffer content
-        output = ''.join(self._output_buffer)
+        output = _decode_from(self._output_buffer)
 
-        # Extract hostname
-        hostname_patterns = {
-            DeviceType.CiscoIOS: r'hostname\s+([^\s\r\n]+)',
-            DeviceType.CiscoNXOS: r'hostname\s+([^\s\r\n]+)',
-            DeviceType.CiscoASA: r'hostname\s+([^\s\r\n]+)',
-            DeviceType.AristaEOS: r'hostname\s+([^\s\r\n]+)',
-            DeviceType.JuniperJunOS: r'host-name\s+([^\s\r\n;]+)',
-            DeviceType.Linux: r'Hostname:[^\n]*(\S+)[\r\n]',
-            DeviceType.GenericUnix: r'([A-Za-z0-9\-]+)[@][^:]+:'
-        }
-
-        if self._device_info.device_type in hostname_patterns:
-            pattern = hostname_patterns[self._device_info.device_type]
-            match = re.search(pattern, output, re.IGNORECASE)
-            if match and match.group(1):
-                self._device_info.hostname = match.group(1)
+        # Fill in whatever the identification loop has not already found
+        self._extract_from(output)
 
         # If we couldn't extract a hostname, use the prompt as a fallback
         if not self._device_info.hostname and self._device_info.detected_prompt:
             # Extract hostname from prompt (typical format username@hostname or hostname#)
-            prompt_hostname_match = re.match(
-                r'^([A-Za-z0-9\-._]+)(?:[>#]|$)',
-                self._device_info.detected_prompt
-            )
+            prompt_hostname_match = _PROMPT_HOSTNAME_RE.match(self._device_info.detected_prompt)
             if prompt_hostname_match and prompt_hostname_match.group(1):
                 self._device_info.hostname = prompt_hostname_match.group(1)
 
-        # Extract serial number - common pattern across many devices
-        serial_match = re.search(r'[Ss]erial\s*[Nn]umber\s*:?\s*([A-Za-z0-9\-]+)', output, re.IGNORECASE)
-        if serial_match and serial_match.group(1):
-            self._device_info.serial_number = serial_match.group(1).strip()
-
-        # Extract more details based on device type
-        if self._device_info.device_type == DeviceType.CiscoIOS:
-            # Extract version from "show version" output
-            version_match = re.search(r'(?:IOS|Software).+?Version\s+([^,\s\r\n]+)', output, re.IGNORECASE)
-            if version_match and version_match.group(1):
-                self._device_info.version = version_match.group(1).strip()
-
-            # Extract model information
-            model_match = re.search(r'[Cc]isco\s+([A-Za-z0-9\-]+)(?:\s+[^\n]*?)(?:processor|chassis|router|switch)',
-                                    output,
-                                    re.DOTALL)
-            if model_match and model_match.group(1):
-                self._device_info.model = model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.CiscoNXOS:
-            # Extract version for NX-OS
-            nxos_version_match = re.search(r'NXOS:\s+version\s+([^,\s\r\n]+)', output, re.IGNORECASE)
-            if nxos_version_match and nxos_version_match.group(1):
-                self._device_info.version = nxos_version_match.group(1).strip()
-
-            # Extract model for Nexus
-            nxos_model_match = re.search(r'cisco\s+Nexus\s+([^\s]+)', output, re.IGNORECASE)
-            if nxos_model_match and nxos_model_match.group(1):
-                self._device_info.model = "Nexus " + nxos_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.CiscoASA:
-            # Extract version for ASA
-            asa_version_match = re.search(r'Adaptive Security Appliance.*?Version\s+([^,\s\r\n]+)', output,
-                                          re.IGNORECASE)
-            if asa_version_match and asa_version_match.group(1):
-                self._device_info.version = asa_version_match.group(1).strip()
-
-            # Extract model for ASA
-            asa_model_match = re.search(r'Hardware:\s+([^,\r\n]+)', output, re.IGNORECASE)
-            if asa_model_match and asa_model_match.group(1):
-                self._device_info.model = asa_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.AristaEOS:
-            # Extract version for Arista EOS
-            arista_version_match = re.search(r'EOS\s+version\s+([^,\s\r\n]+)', output, re.IGNORECASE)
-            if arista_version_match and arista_version_match.group(1):
-                self._device_info.version = arista_version_match.group(1).strip()
-
-            # Extract model for Arista switches
-            arista_model_match = re.search(r'Arista\s+([A-Za-z0-9\-]+)', output, re.IGNORECASE)
-            if arista_model_match and arista_model_match.group(1):
-                self._device_info.model = arista_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.JuniperJunOS:
-            # Extract version for JunOS
-            junos_version_match = re.search(r'JUNOS\s+([^,\s\r\n\]]+)', output, re.IGNORECASE)
-            if junos_version_match and junos_version_match.group(1):
-                self._device_info.version = junos_version_match.group(1).strip()
-
-            # Extract model for Juniper
-            junos_model_match = re.search(r'Model:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if junos_model_match and junos_model_match.group(1):
-                self._device_info.model = junos_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.HPProCurve:
-            # Extract version for HP ProCurve
-            hp_version_match = re.search(r'Software\s+revision\s*:?\s*([^\r\n]+)', output, re.IGNORECASE)
-            if hp_version_match and hp_version_match.group(1):
-                self._device_info.version = hp_version_match.group(1).strip()
-
-            # Extract model for HP
-            hp_model_match = re.search(r'[Ss]witch\s+([A-Za-z0-9\-]+)', output)
-            if hp_model_match and hp_model_match.group(1):
-                self._device_info.model = hp_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.FortiOS:
-            # Extract version for FortiOS
-            forti_version_match = re.search(r'Version:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if forti_version_match and forti_version_match.group(1):
-                self._device_info.version = forti_version_match.group(1).strip()
-
-            # Extract model for FortiGate
-            forti_model_match = re.search(r'FortiGate-([A-Za-z0-9\-]+)', output, re.IGNORECASE)
-            if forti_model_match and forti_model_match.group(1):
-                self._device_info.model = "FortiGate-" + forti_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.PaloAltoOS:
-            # Extract version for PAN-OS
-            palo_version_match = re.search(r'sw-version:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if palo_version_match and palo_version_match.group(1):
-                self._device_info.version = palo_version_match.group(1).strip()
-
-            # Extract model for Palo Alto
-            palo_model_match = re.search(r'model:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if palo_model_match and palo_model_match.group(1):
-                self._device_info.model = palo_model_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.Linux:
-            # Extract Linux distribution and version
-            linux_version_match = re.search(r'PRETTY_NAME="([^"]+)"', output, re.IGNORECASE)
-            if linux_version_match and linux_version_match.group(1):
-                self._device_info.version = linux_version_match.group(1).strip()
-            else:
-                # Try uname output
-                uname_match = re.search(r'Linux\s+\S+\s+([^\s]+)', output)
-                if uname_match and uname_match.group(1):
-                    self._device_info.version = uname_match.group(1).strip()
-
-            # For Linux, we might extract CPU information
-            cpu_info_match = re.search(r'model name\s*:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if cpu_info_match and cpu_info_match.group(1):
-                self._device_info.cpu_info = cpu_info_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.FreeBSD:
-            # Extract FreeBSD version
-            freebsd_version_match = re.search(r'FreeBSD\s+\S+\s+([^\s]+)', output)
-            if freebsd_version_match and freebsd_version_match.group(1):
-                self._device_info.version = freebsd_version_match.group(1).strip()
-
-        elif self._device_info.device_type == DeviceType.Windows:
-            # Extract Windows version
-            windows_version_match = re.search(r'OS Name:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if windows_version_match and windows_version_match.group(1):
-                self._device_info.version = windows_version_match.group(1).strip()
-
-            # Extract Windows model
-            windows_model_match = re.search(r'System Model:\s*([^\r\n]+)', output, re.IGNORECASE)
-            if windows_model_match and windows_model_match.group(1):
-                self._device_info.model = windows_model_match.group(1).strip()
-
         # Extract IP address information from outputs if available
         ip_addresses = []
-
-        # Look for IP addresses in output
-        ip_pattern = r'\b(?:\d{1,3}\.){3}\d{1,3}(?:/\d{1,2})?\b'
-        ip_matches = re.finditer(ip_pattern, output)
+        seen_ips = set()
 
         # Filter to get likely management IPs (not every IP in the output)
-        for match in ip_matches:
+        for match in _IP_RE.finditer(output):
             ip = match.group(0)
 
-            # Skip obviously invalid IPs
-            if ip.startswith('0.') or ip.startswith('255.'):
+            # Skip IPs already collected and obviously invalid ones
+            if ip in seen_ips or ip.startswith('0.') or ip.startswith('255.'):
                 continue
 
             # Check context - look for lines with "ip address" or similar
-            line_start = max(0, match.start() - 50)
-            line_end = min(len(output), match.end() + 50)
-            context = output[line_start:line_end].lower()
+            context = output[max(0, match.start() - 50):match.end() + 50].lower()
 
-            if any(term in context for term in ['ip address', 'management', 'vlan', 'interface']):
-                if ip not in ip_addresses:
-                    ip_addresses.append(ip)
+            if any(term in context for term in _IP_CONTEXT_TERMS):
+                seen_ips.add(ip)
+                ip_addresses.append(ip)
 
-        # Add up to 5 most likely IPs, but don't overload with too many
-        self._device_info.ip_addresses.extend(ip_addresses[:5])
+                # Add up to 5 most likely IPs, but don't overload with too many
+                if len(ip_addresses) >= 5:
+                    break
 
-        # Extract interface information for network devices
-        if self._device_info.device_type in [DeviceType.CiscoIOS, DeviceType.CiscoNXOS,
-                                             DeviceType.CiscoASA, DeviceType.AristaEOS,
-                                             DeviceType.JuniperJunOS]:
-            # Look for interface patterns like "GigabitEthernet0/0 is up, line protocol is up"
-            interface_matches = re.finditer(r'([A-Za-z0-9/\-\.]+)\s+is\s+(up|down|administratively down)', output)
-            for match in interface_matches:
-                interface_name = match.group(1)
-                interface_status = match.group(2)
-
-                # Get IP if available (for this interface)
-                ip_match = re.search(f'{re.escape(interface_name)}.*?({ip_pattern})', output, re.DOTALL)
-                interface_info = "Status: {}".format(interface_status)
+        self._device_info.ip_addresses.extend(ip_addresses)
 
+        # Extract interface information for network devices
+        if self._device_info.device_type in _NETWORK_DEVICE_TYPES:
+            # Attach the first IP that follows an interface status line to that interface,
+            # searching only up to the next interface's status line
+            interface_matches = list(_IFACE_STATUS_RE.finditer(output))
+            block_ends = [match.start() for match in interface_matches[1:]] + [len(output)]
+            for match, block_end in zip(interface_matches, block_ends):
+                details = "Status: {}".format(match.group('status'))
+                ip_match = _IP_RE.search(output, match.end(), block_end)
                 if ip_match:
-                    interface_info += ", IP: {}".format(ip_match.group(1))
-
-                self._device_info.interfaces[interface_name] = interface_info
\ No newline at end of file
+                    details += ", IP: {}".format(ip_match.group(0))
+                self._device_info.interfaces[match.group('iface')] = details
@@ -42,6 +42,8 @@ class DeviceType(Enum):
     def get_identification_commands(self) -> List[str]:
         """Get identification commands specific to this device type"""
         commands = {
+            # Generic probes used until the device type has been identified
+            DeviceType.Unknown: ["show version", "show system info"],
             DeviceType.CiscoIOS: ["show version", "show inventory", "show running-config | include hostname"],
             DeviceType.CiscoNXOS: ["show version", "show inventory", "show hostname"],
             DeviceType.CiscoASA: ["show version", "show inventory", "show running-config | include hostname"],
@@ -19,10 +19,102 @@ Example usage:
 """
 
 import re
+import time
 import datetime
-
-
-def parse_ping_output(ping_output, target_host="unknown", platform=None):
+from collections.abc import Mapping
+from functools import lru_cache
+
+# Parsing is pure string and regex work, which JIT compilers such as Numba cannot
+# compile in nopython mode, so the parsers stay in plain Python. The heavy lifting is
+# already done in C by str.count, substring checks and precompiled literal-prefixed
+# patterns; a compiled extension would only pay off for bulk ingestion and is not
+# worth the extra build step for this library.
+
+# Patterns are compiled once at import time instead of being looked up on every parse
+_RE_VRF = re.compile(r'ping\s+vrf\s+\S+\s+(\S+)')
+_RE_STD = re.compile(r'ping\s+(\S+)')
+_RE_HEADER = re.compile(r'PING\s+\S+\s+\((\S+)\)')
+_RE_STATS_HEADER = re.compile(r'--- (\S+) ping statistics ---')
+
+# The target host appears in the command/header at the start of the output or in the
+# statistics line at the end, so only this many characters (rounded out to whole
+# lines) are searched at either end
+_HOST_SCAN_CHARS = 256
+
+# Everything parse_ping_output can extract. Stats are always parsed since success is
+# derived from them, skipping "rtt" or "host" saves their scans
+_EXTRACT_ALL = ('stats', 'rtt', 'host')
+
+_RE_CISCO_SUCCESS = re.compile(r'Success rate is (\d+) percent \((\d+)/(\d+)\)')
+_RE_CISCO_SENDING = re.compile(r'Sending (\d+),')
+_RE_CISCO_RTT = re.compile(r'round-trip min/avg/max\s*=\s*([\d\.]+)/([\d\.]+)/([\d\.]+)\s*ms')
+
+_RE_ARISTA_STATS = re.compile(r'(\d+) packets transmitted, (\d+) received, (\d+)% packet loss')
+_RE_ARISTA_RTT = re.compile(r'rtt min/avg/max/mdev = ([\d\.]+)/([\d\.]+)/([\d\.]+)/([\d\.]+) ms')
+
+_RE_HP_STATS = re.compile(r'(\d+) packets transmitted, (\d+) packets received')
+# HP RTT values are searched for separately within one line, since a single pattern with
+# lazy gaps between them backtracks through every line that mentions only "min ="
+_RE_HP_MIN = re.compile(r'min\s*=\s*([\d\.]+)')
+_RE_HP_AVG = re.compile(r'avg\s*=\s*([\d\.]+)')
+_RE_HP_MAX = re.compile(r'max\s*=\s*([\d\.]+)')
+
+_RE_GENERIC_STATS = re.compile(r'(\d+) packets transmitted, (\d+) received')
+_RE_GENERIC_RTT = re.compile(r'min/avg/max(?:/mdev)?\s*=\s*([\d\.]+)(?:ms)?\s*/\s*([\d\.]+)(?:ms)?\s*/\s*([\d\.]+)')
+
+
+class PingResult(Mapping):
+    """Parsed ping statistics, readable and writable by key like the dict it replaced"""
+
+    __slots__ = ('success', 'target_host', 'packets_sent', 'packets_received', 'packet_loss_percent',
+                 'rtt_min', 'rtt_avg', 'rtt_max', 'created')
+
+    # Keys available by item access and in to_dict, in their original order
+    _KEYS = ('success', 'target_host', 'packets_sent', 'packets_received', 'packet_loss_percent',
+             'rtt_min', 'rtt_avg', 'rtt_max', 'timestamp')
+
+    def __init__(self, target_host="unknown"):
+        self.success = False
+        self.target_host = target_host
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.packet_loss_percent = 100.0
+        self.rtt_min = None
+        self.rtt_avg = None
+        self.rtt_max = None
+        # Epoch seconds, only formatted when the timestamp is read
+        self.created = time.time()
+
+    @property
+    def timestamp(self):
+        """Creation time as an ISO 8601 string"""
+        return datetime.datetime.fromtimestamp(self.created).isoformat()
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def to_dict(self):
+        """Convert the result to a dictionary (for JSON serialization, which needs a real dict)"""
+        return {name: getattr(self, name) for name in self._KEYS}
+
+
+def parse_ping_output(ping_output, target_host="unknown", platform=None, extract=_EXTRACT_ALL):
     """
     Parse the ping output and extract relevant statistics
 
@@ -30,77 +122,92 @@ def parse_ping_output(ping_output, target_host="unknown", platform=None):
         ping_output (str): Raw ping command output
         target_host (str, optional): Target host IP or hostname
         platform (str, optional): Device platform (cisco_ios, arista_eos, hp_aruba, etc.)
+        extract (tuple, optional): Parts to extract out of 'stats', 'rtt' and 'host'
 
     Returns:
-        dict: Parsed ping output with statistics
+        PingResult: Parsed ping output with statistics
     """
     # Create result structure
-    result = {
-        'success': False,
-        'target_host': target_host,
-        'packets_sent': 0,
-        'packets_received': 0,
-        'packet_loss_percent': 100.0,
-        'rtt_min': None,
-        'rtt_avg': None,
-        'rtt_max': None,
-        'timestamp': datetime.datetime.now().isoformat()
-    }
+    result = PingResult(target_host)
 
     if not ping_output:
         return result
 
     # Try to extract target host if not provided
-    if target_host == "unknown":
+    if target_host == "unknown" and 'host' in extract:
         target_host = extract_target_host(ping_output)
         result['target_host'] = target_host
 
     # Process based on platform type
+    _resolve_parser(platform)(ping_output, result, extract)
+
+    return result
+
+
+# Callers tend to pass the same few platform names, so remember what each resolved to
+@lru_cache(maxsize=32)
+def _resolve_parser(platform):
+    """Return the parse function for a platform name, generic parsing for unknown platforms"""
     platform_lower = platform.lower() if platform else ""
 
-    if platform_lower.startswith('cisco'):
-        parse_cisco_output(ping_output, result)
-    elif platform_lower.startswith('arista'):
-        parse_arista_output(ping_output, result)
-    elif platform_lower.startswith(('hp', 'aruba')):
-        parse_hp_output(ping_output, result)
-    else:
-        # Generic parsing for unknown platforms
-        parse_generic_output(ping_output, result)
+    for prefix, parser in _PLATFORM_PARSERS:
+        if platform_lower.startswith(prefix):
+            return parser
 
-    return result
+    return parse_generic_output
 
 
 def extract_target_host(ping_output):
     """Extract target host from ping command output"""
+    head_end = ping_output.find('\n', _HOST_SCAN_CHARS)
+    if head_end == -1:
+        head_end = len(ping_output)
+    tail_start = ping_output.rfind('\n', 0, max(0, len(ping_output) - _HOST_SCAN_CHARS)) + 1
+
     # VRF ping format
-    vrf_match = re.search(r'ping\s+vrf\s+\S+\s+(\S+)', ping_output)
+    vrf_match = _RE_VRF.search(ping_output, 0, head_end)
     if vrf_match:
         return vrf_match.group(1)
 
     # Standard ping format
-    std_match = re.search(r'ping\s+(\S+)', ping_output)
+    std_match = _RE_STD.search(ping_output, 0, head_end)
     if std_match:
         return std_match.group(1)
 
     # PING header format
-    header_match = re.search(r'PING\s+\S+\s+\((\S+)\)', ping_output)
+    header_match = _RE_HEADER.search(ping_output, 0, head_end)
     if header_match:
         return header_match.group(1)
 
     # Stats line format
-    stats_match = re.search(r'--- (\S+) ping statistics ---', ping_output)
+    stats_match = _RE_STATS_HEADER.search(ping_output, tail_start)
     if stats_match:
         return stats_match.group(1)
 
     return "unknown"
 
 
-def parse_cisco_output(ping_output, result):
+def _loss_percent(packets_sent, packets_received):
+    """Packet loss percentage, kept as an int when it is a whole number"""
+    lost = (packets_sent - packets_received) * 100
+    if lost % packets_sent == 0:
+        return lost // packets_sent
+    return lost / packets_sent
+
+
+def parse_cisco_output(ping_output, result, extract=_EXTRACT_ALL):
     """Parse Cisco format ping output"""
+    # Nothing to parse without a success rate, replies or an RTT summary
+    if 'Success rate' not in ping_output and '!' not in ping_output and 'round-trip' not in ping_output:
+        return
+
+    # The RTT summary follows the success rate, so its scan starts where that match ended
+    rtt_start = 0
+
     # Check for Success rate pattern
-    success_match = re.search(r'Success rate is (\d+) percent \((\d+)/(\d+)\)', ping_output)
+    success_match = _RE_CISCO_SUCCESS.search(ping_output)
     if success_match:
+        rtt_start = success_match.end()
         success_percent = int(success_match.group(1))
         packets_received = int(success_match.group(2))
         packets_sent = int(success_match.group(3))
@@ -110,7 +217,7 @@ def parse_cisco_output(ping_output, result):
         result['success'] = packets_received > 0
 
         if packets_sent > 0:
-            result['packet_loss_percent'] = ((packets_sent - packets_received) / packets_sent) * 100
+            result['packet_loss_percent'] = _loss_percent(packets_sent, packets_received)
 
     # If no match, check for exclamation marks (successful pings)
     elif '!' in ping_output:
@@ -120,26 +227,33 @@ def parse_cisco_output(ping_output, result):
             result['packets_received'] = exclamation_count
 
             # Try to find total packets sent
-            sending_match = re.search(r'Sending (\d+),', ping_output)
+            sending_match = _RE_CISCO_SENDING.search(ping_output)
             if sending_match:
                 result['packets_sent'] = int(sending_match.group(1))
                 if result['packets_sent'] > 0:
-                    result['packet_loss_percent'] = ((result['packets_sent'] - result['packets_received']) /
-                                                     result['packets_sent']) * 100
+                    result['packet_loss_percent'] = _loss_percent(result['packets_sent'],
+                                                                  result['packets_received'])
 
     # Parse RTT values
-    rtt_match = re.search(r'round-trip min/avg/max\s*=\s*([\d\.]+)/([\d\.]+)/([\d\.]+)\s*ms', ping_output)
-    if rtt_match:
-        result['rtt_min'] = float(rtt_match.group(1))
-        result['rtt_avg'] = float(rtt_match.group(2))
-        result['rtt_max'] = float(rtt_match.group(3))
+    if 'rtt' in extract:
+        rtt_match = _RE_CISCO_RTT.search(ping_output, rtt_start)
+        if rtt_match:
+            result['rtt_min'], result['rtt_avg'], result['rtt_max'] = map(float, rtt_match.group(1, 2, 3))
 
 
-def parse_arista_output(ping_output, result):
+def parse_arista_output(ping_output, result, extract=_EXTRACT_ALL):
     """Parse Arista format ping output"""
+    # Nothing to parse without a stats line or an RTT summary
+    if 'packets transmitted' not in ping_output and 'rtt min' not in ping_output:
+        return
+
+    # The RTT summary follows the stats line, so its scan starts where that match ended
+    rtt_start = 0
+
     # Check for standard ping stats pattern
-    stats_match = re.search(r'(\d+) packets transmitted, (\d+) received, (\d+)% packet loss', ping_output)
+    stats_match = _RE_ARISTA_STATS.search(ping_output)
     if stats_match:
+        rtt_start = stats_match.end()
         packets_sent = int(stats_match.group(1))
         packets_received = int(stats_match.group(2))
         packet_loss = int(stats_match.group(3))
@@ -150,23 +264,26 @@ def parse_arista_output(ping_output, result):
         result['success'] = packets_received > 0
 
     # Parse RTT values
-    rtt_match = re.search(r'rtt min/avg/max/mdev = ([\d\.]+)/([\d\.]+)/([\d\.]+)/([\d\.]+) ms', ping_output)
-    if rtt_match:
-        result['rtt_min'] = float(rtt_match.group(1))
-        result['rtt_avg'] = float(rtt_match.group(2))
-        result['rtt_max'] = float(rtt_match.group(3))
+    if 'rtt' in extract:
+        rtt_match = _RE_ARISTA_RTT.search(ping_output, rtt_start)
+        if rtt_match:
+            result['rtt_min'], result['rtt_avg'], result['rtt_max'] = map(float, rtt_match.group(1, 2, 3))
 
 
-def parse_hp_output(ping_output, result):
+def parse_hp_output(ping_output, result, extract=_EXTRACT_ALL):
     """Parse HP/Aruba format ping output"""
+    # Nothing to parse without replies, a stats line or RTT values
+    if 'is alive' not in ping_output and 'packets transmitted' not in ping_output and 'min' not in ping_output:
+        return
+
     # Check for "is alive" messages
-    alive_matches = re.findall(r'is alive', ping_output)
-    if alive_matches:
+    alive_count = ping_output.count('is alive')
+    if alive_count:
         result['success'] = True
-        result['packets_received'] = len(alive_matches)
+        result['packets_received'] = alive_count
 
     # Check for standard ping stats pattern as fallback
-    stats_match = re.search(r'(\d+) packets transmitted, (\d+) packets received', ping_output)
+    stats_match = _RE_HP_STATS.search(ping_output)
     if stats_match:
         packets_sent = int(stats_match.group(1))
         packets_received = int(stats_match.group(2))
@@ -176,20 +293,37 @@ def parse_hp_output(ping_output, result):
         result['success'] = packets_received > 0
 
         if packets_sent > 0:
-            result['packet_loss_percent'] = ((packets_sent - packets_received) / packets_sent) * 100
+            result['packet_loss_percent'] = _loss_percent(packets_sent, packets_received)
 
-    # Parse RTT values
-    rtt_match = re.search(r'min\s*=\s*([\d\.]+).*?avg\s*=\s*([\d\.]+).*?max\s*=\s*([\d\.]+)', ping_output)
-    if rtt_match:
-        result['rtt_min'] = float(rtt_match.group(1))
-        result['rtt_avg'] = float(rtt_match.group(2))
-        result['rtt_max'] = float(rtt_match.group(3))
+    # Parse RTT values from the first line that has min, avg and max in that order
+    if 'rtt' in extract:
+        for min_match in _RE_HP_MIN.finditer(ping_output):
+            line_end = ping_output.find('\n', min_match.end())
+            if line_end == -1:
+                line_end = len(ping_output)
 
+            avg_match = _RE_HP_AVG.search(ping_output, min_match.end(), line_end)
+            if not avg_match:
+                continue
+            max_match = _RE_HP_MAX.search(ping_output, avg_match.end(), line_end)
+            if not max_match:
+                continue
 
-def parse_generic_output(ping_output, result):
+            result['rtt_min'] = float(min_match.group(1))
+            result['rtt_avg'] = float(avg_match.group(1))
+            result['rtt_max'] = float(max_match.group(1))
+            break
+
+
+def parse_generic_output(ping_output, result, extract=_EXTRACT_ALL):
     """Generic parsing for unknown platform output"""
+    # Nothing to parse without a stats line, an RTT summary or any reply markers
+    if ('packets transmitted' not in ping_output and 'min/avg/max' not in ping_output and
+            '!' not in ping_output and 'bytes from' not in ping_output):
+        return
+
     # Try standard ping stats pattern
-    stats_match = re.search(r'(\d+) packets transmitted, (\d+) received', ping_output)
+    stats_match = _RE_GENERIC_STATS.search(ping_output)
     if stats_match:
         packets_sent = int(stats_match.group(1))
         packets_received = int(stats_match.group(2))
@@ -199,15 +333,13 @@ def parse_generic_output(ping_output, result):
         result['success'] = packets_received > 0
 
         if packets_sent > 0:
-            result['packet_loss_percent'] = ((packets_sent - packets_received) / packets_sent) * 100
+            result['packet_loss_percent'] = _loss_percent(packets_sent, packets_received)
 
     # Try standard RTT pattern
-    rtt_match = re.search(r'min/avg/max(?:/mdev)?\s*=\s*([\d\.]+)(?:ms)?\s*/\s*([\d\.]+)(?:ms)?\s*/\s*([\d\.]+)',
-                          ping_output)
-    if rtt_match:
-        result['rtt_min'] = float(rtt_match.group(1))
-        result['rtt_avg'] = float(rtt_match.group(2))
-        result['rtt_max'] = float(rtt_match.group(3))
+    if 'rtt' in extract:
+        rtt_match = _RE_GENERIC_RTT.search(ping_output)
+        if rtt_match:
+            result['rtt_min'], result['rtt_avg'], result['rtt_max'] = map(float, rtt_match.group(1, 2, 3))
 
     # Check for response indicators
     if not result['success']:
@@ -219,12 +351,21 @@ def parse_generic_output(ping_output, result):
                 result['packets_received'] = exclamation_count
 
         # Check for bytes from (common in Linux/Unix)
-        bytes_from_count = len(re.findall(r'bytes from', ping_output))
+        bytes_from_count = ping_output.count('bytes from')
         if bytes_from_count > 0:
             result['success'] = True
             result['packets_received'] = bytes_from_count
 
 
+# Platform name prefixes and the parser that handles them, checked in order
+_PLATFORM_PARSERS = (
+    ('cisco', parse_cisco_output),
+    ('arista', parse_arista_output),
+    ('hp', parse_hp_output),
+    ('aruba', parse_hp_output),
+)
+
+
 # Simple usage example
 if __name__ == "__main__":
     import sys
@@ -246,4 +387,4 @@ if __name__ == "__main__":
     # Print the result
     import json
 
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    print(json.dumps(result.to_dict(), indent=2))
\ No newline at end of file
@@ -4,7 +4,9 @@ import sys
 import json
 import time
 import argparse
+import itertools
 import traceback
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 from datetime import datetime
@@ -25,6 +27,23 @@ except ImportError:
         sys.exit(1)
 
 
+# orjson is optional, when available it serializes fingerprints several times faster
+try:
+    import orjson
+
+    def _dumps(obj):
+        """Serialize obj to indented JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj):
+        """Serialize obj to indented JSON bytes"""
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+
+# Translation table that deletes carriage returns from saved output
+_STRIP_CR = str.maketrans('', '', '\r')
+
+
 class SPN:
     VERSION = "1.0.0"
     COPYRIGHT = "Copyright (C) 2025 SSHPassPython"
@@ -40,73 +59,20 @@ class SPN:
 
     def parse_arguments(self):
         """Parse command line arguments to match the C# application"""
-        # Create parser with add_help=False to avoid the -h conflict
-        parser = argparse.ArgumentParser(
-            description=f"SSHPassPython {self.VERSION}\n{self.COPYRIGHT}",
-            formatter_class=argparse.RawTextHelpFormatter,
-            add_help=False  # Disable automatic -h for help
-        )
-
-        # Add explicit help argument with a different flag
-        parser.add_argument("--help", action="help",
-                            help="Show this help message and exit")
-
-        # Required arguments - NOTE: Changed -h to --host only to avoid conflict
-        parser.add_argument("--host", required=True, help="SSH Host (ip:port)")
-        parser.add_argument("-u", "--user", required=True, help="SSH Username")
-        parser.add_argument("-p", "--password", required=True, help="SSH Password")
-
-        # Command options
-        parser.add_argument("-c", "--cmds", default="", help="Commands to run, separated by comma")
-
-        # SSH options
-        parser.add_argument("--invoke-shell", action="store_true",
-                            help="Invoke shell before running the command")
-        parser.add_argument("--prompt", default="",
-                            help="Prompt to look for before breaking the shell")
-        parser.add_argument("--prompt-count", type=int, default=1,
-                            help="Number of prompts to look for before breaking the shell")
-        parser.add_argument("-t", "--timeout", type=int, default=360,
-                            help="Command timeout duration in seconds")
-        parser.add_argument("--shell-timeout", type=int, default=10,
-                            help="Overall shell session timeout in seconds (default is 10 seconds)")
-        parser.add_argument("-i", "--inter-command-time", type=int, default=1,
-                            help="Inter-command time in seconds")
-
-        # Logging and output
-        parser.add_argument("--log-file", default="",
-                            help="Path to log file (default is ./logs/hostname.log)")
-        parser.add_argument("--require-hyphen", action="store_true",
-                            help="Require hyphen in prompt detection (for Cisco/network devices)")
-        parser.add_argument("-d", "--debug", action="store_true", help="Enable debug output")
-
-        # Fingerprinting options
-        parser.add_argument("-f", "--fingerprint", action="store_true",
-                            help="Fingerprint device before executing commands")
-        parser.add_argument("-o", "--fingerprint-output", default="",
-                            help="Save fingerprint results to JSON file")
-        parser.add_argument("-v", "--verbose", action="store_true", help="Show verbose output")
-
-        # Save output
-        parser.add_argument("-s", "--save", default="", help="File path to save command output")
-
-        # Version info
-        parser.add_argument("--version", action="version",
-                            version=f"SSHPassPython {self.VERSION}\n{self.COPYRIGHT}")
-
-        return parser.parse_args()
+        return _build_parser().parse_args()
 
     def parse_host_port(self, host_arg: str) -> tuple:
         """Parse host:port format, defaulting to port 22 if not specified"""
-        if ":" in host_arg:
-            host, port_str = host_arg.split(":", 1)
-            try:
-                port = int(port_str)
-                return host, port
-            except ValueError:
-                print(f"Invalid port: {port_str}. Using default port 22.")
-                return host_arg, 22
-        return host_arg, 22
+        host, separator, port_str = host_arg.partition(":")
+        if not separator:
+            return host_arg, 22
+
+        try:
+            port = int(port_str)
+            return host, port
+        except ValueError:
+            print(f"Invalid port: {port_str}. Using default port 22.")
+            return host_arg, 22
 
     def setup_logging(self) -> str:
         """Setup logging based on arguments"""
@@ -175,8 +141,8 @@ class SPN:
                     # Format the JSON to match C# output format
                     formatted_json = self.format_fingerprint_json(device_info)
 
-                    with open(self.args.fingerprint_output, 'w') as f:
-                        json.dump(formatted_json, f, indent=2)
+                    with open(self.args.fingerprint_output, 'wb') as f:
+                        f.write(_dumps(formatted_json))
                     print(f"Fingerprint saved to {self.args.fingerprint_output}")
                 except Exception as e:
                     print(f"Error saving fingerprint to file: {str(e)}")
@@ -193,8 +159,8 @@ class SPN:
 
         print(f"Executing commands on {self.host}:{self.port}...")
 
-        # Parse commands
-        commands = self.args.cmds.split(',')
+        # Parse commands lazily, skipping empty entries
+        commands = (cmd.strip() for cmd in self.args.cmds.split(',') if cmd.strip())
 
         # Configure SSH client based on arguments
         ssh_options = SSHClientOptions(
@@ -218,7 +184,7 @@ class SPN:
 
             # Also use the disable paging command if available
             if device_info.disable_paging_command:
-                commands.insert(0, device_info.disable_paging_command)
+                commands = itertools.chain([device_info.disable_paging_command], commands)
 
         ssh_client = SSHClient(ssh_options)
 
@@ -226,36 +192,43 @@ class SPN:
             # Connect to the device
             ssh_client.connect()
 
-            # Execute each command in sequence
-            results = []
-            for cmd in commands:
-                cmd = cmd.strip()
-                if not cmd:
-                    continue
-
-                if self.args.verbose:
-                    print(f"Executing command: {cmd}")
-
-                result = ssh_client.execute_command(cmd)
-                results.append(result)
-
-            # Combine all results
-            full_output = "\n".join(results)
-
-            # Save output if requested
+            # Output is written to the save file as each command completes, so the full
+            # transcript is only kept in memory when it isn't being saved
+            save_file = None
             if self.args.save:
                 try:
-                    cleaned_output = full_output.replace("\r","")
-                    with open(self.args.save, 'w', encoding='utf-8') as f:
-                        f.write(cleaned_output)
-                    print(f"Command output saved to {self.args.save}")
+                    save_file = open(self.args.save, 'w', encoding='utf-8')
                 except Exception as e:
                     print(f"Error saving output to file: {str(e)}")
 
+            # Execute each command in sequence
+            results = []
+            try:
+                for index, cmd in enumerate(commands):
+                    if self.args.verbose:
+                        print(f"Executing command: {cmd}")
+
+                    result = ssh_client.execute_command(cmd)
+                    if save_file:
+                        if index:
+                            save_file.write("\n")
+                        save_file.write(result.translate(_STRIP_CR))
+                    else:
+                        results.append(result)
+            finally:
+                if save_file:
+                    save_file.close()
+
+            if save_file:
+                print(f"Command output saved to {self.args.save}")
+
             # Disconnect
             ssh_client.disconnect()
 
-            return full_output
+            # Combine all results, nothing is returned when the output was saved
+            if save_file:
+                return None
+            return "\n".join(results)
 
         except Exception as e:
             traceback.print_exc()
@@ -286,6 +259,67 @@ class SPN:
         print("Done.")
 
 
+# The parser never changes, so it is built once and reused by every SPN instance
+@lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command line parser, matching the C# application's arguments"""
+    # Create parser with add_help=False to avoid the -h conflict
+    parser = argparse.ArgumentParser(
+        description=f"SSHPassPython {SPN.VERSION}\n{SPN.COPYRIGHT}",
+        formatter_class=argparse.RawTextHelpFormatter,
+        add_help=False  # Disable automatic -h for help
+    )
+
+    # Add explicit help argument with a different flag
+    parser.add_argument("--help", action="help",
+                        help="Show this help message and exit")
+
+    # Required arguments - NOTE: Changed -h to --host only to avoid conflict
+    parser.add_argument("--host", required=True, help="SSH Host (ip:port)")
+    parser.add_argument("-u", "--user", required=True, help="SSH Username")
+    parser.add_argument("-p", "--password", required=True, help="SSH Password")
+
+    # Command options
+    parser.add_argument("-c", "--cmds", default="", help="Commands to run, separated by comma")
+
+    # SSH options
+    parser.add_argument("--invoke-shell", action="store_true",
+                        help="Invoke shell before running the command")
+    parser.add_argument("--prompt", default="",
+                        help="Prompt to look for before breaking the shell")
+    parser.add_argument("--prompt-count", type=int, default=1,
+                        help="Number of prompts to look for before breaking the shell")
+    parser.add_argument("-t", "--timeout", type=int, default=360,
+                        help="Command timeout duration in seconds")
+    parser.add_argument("--shell-timeout", type=int, default=10,
+                        help="Overall shell session timeout in seconds (default is 10 seconds)")
+    parser.add_argument("-i", "--inter-command-time", type=int, default=1,
+                        help="Inter-command time in seconds")
+
+    # Logging and output
+    parser.add_argument("--log-file", default="",
+                        help="Path to log file (default is ./logs/hostname.log)")
+    parser.add_argument("--require-hyphen", action="store_true",
+                        help="Require hyphen in prompt detection (for Cisco/network devices)")
+    parser.add_argument("-d", "--debug", action="store_true", help="Enable debug output")
+
+    # Fingerprinting options
+    parser.add_argument("-f", "--fingerprint", action="store_true",
+                        help="Fingerprint device before executing commands")
+    parser.add_argument("-o", "--fingerprint-output", default="",
+                        help="Save fingerprint results to JSON file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show verbose output")
+
+    # Save output
+    parser.add_argument("-s", "--save", default="", help="File path to save command output")
+
+    # Version info
+    parser.add_argument("--version", action="version",
+                        version=f"SSHPassPython {SPN.VERSION}\n{SPN.COPYRIGHT}")
+
+    return parser
+
+
 def main():
     """Entry point for the program"""
     spn = SPN()
@@ -3,16 +3,63 @@ import time
 import re
 import logging
 import os
+import selectors
 import paramiko
-from io import StringIO
 from datetime import datetime
 
 
+# Patterns are compiled once at import time instead of on every prompt check
+_ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Characters that separate repeated prompts like 'device# device# device#'
+_REPEAT_SPLIT_RE = re.compile(r'[#>$%:]')
+
+# Fallback prompt patterns for _scrub_prompt, tried in order. username@host style prompts
+# are matched by the basic pattern, and text it misses can't match '\S+@\S+[#>$%]' either,
+# so that pattern isn't searched separately
+_PROMPT_PATTERNS = (
+    re.compile(r'(\S+[#>$%])\s*$'),  # Basic prompt at the end of the string
+    re.compile(r'((?:[A-Za-z0-9_\-]+(?:\([^\)]+\))?)?[#>$%])\s*$'),  # Handle context in parentheses like router(config)#
+)
+
+# Characters a prompt commonly ends with, as tuples so str.endswith can test them all in one call
+_PROMPT_ENDINGS = ('#', '>', '$', '%', ':', '~]', ']', '}', ')', '|')
+_SIMPLE_PROMPT_ENDINGS = ('#', '>', '$', '%')
+
+# Shell reads take everything the channel has buffered, capped so prompt checks still run
+# regularly while a large output is streaming in
+_RECV_BYTES = 65536
+_MAX_DRAIN_BYTES = 262144
+
+# Longest wait for a new shell to start talking, and how long it must then be quiet
+# before it is considered initialized
+_SHELL_INIT_TIMEOUT = 2
+_SHELL_SETTLE_TIME = 0.2
+
+
+def _last_nonempty_line(text):
+    """Return the last line of text that isn't blank, stripped, scanning back from the end only"""
+    end = len(text.rstrip())
+    start = text.rfind('\n', 0, end) + 1
+    return text[start:end].strip()
+
+
+def _nonempty_lines_reversed(text):
+    """Yield the lines of text that aren't blank, stripped, starting from the last one"""
+    end = len(text)
+    while end > 0:
+        start = text.rfind('\n', 0, end) + 1
+        line = text[start:end].strip()
+        if line:
+            yield line
+        end = start - 1
+
+
 class SSHClientOptions:
     def __init__(self, host, username, password, port=22, invoke_shell=False,
                  expect_prompt=None, prompt=None, prompt_count=1, timeout=360,
                  shell_timeout=5, inter_command_time=1, log_file=None, debug=False,
-                 expect_prompt_timeout=30000):
+                 expect_prompt_timeout=30000, capture_output=True):
         self.host = host
         self.port = port
         self.username = username
@@ -27,8 +74,11 @@ class SSHClientOptions:
         self.log_file = log_file
         self.debug = debug
         self.expect_prompt_timeout = expect_prompt_timeout
+        # Shell output is only accumulated and returned when set, bulk runners that
+        # consume output through the callback can turn it off to save memory
+        self.capture_output = capture_output
 
-        # Default callbacks if none provided
+        # Default callbacks if none provided, output_callback can be set to None to skip it
         self.output_callback = print
         self.error_callback = lambda msg: print("ERROR: {}".format(msg), file=sys.stderr)
 
@@ -37,8 +87,15 @@ class SSHClient:
     def __init__(self, options):
         self._options = options
         self._ssh_client = None
+        # Transport of the connected client, kept so each command doesn't look it up again
+        self._transport = None
         self._shell = None
-        self._output_buffer = StringIO()
+        # Selector on the shell channel, lets reads block until data arrives instead of polling
+        self._selector = None
+        # Raw bytes received from the shell, decoded once when a command completes
+        self._output_chunks = []
+        # Log file handle, opened on first use and kept until disconnect
+        self._log_handle = None
         self._prompt_detected = False
 
         # Validate required options
@@ -51,6 +108,10 @@ class SSHClient:
 
     def _log_with_timestamp(self, message, always_print=False):
         """Helper method to log with timestamp"""
+        # Skip formatting entirely when the message would be neither printed nor logged
+        if not (always_print or self._options.debug or self._options.log_file):
+            return
+
         # Use datetime instead of time.strftime for microsecond support
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         timestamped_message = "[{}] {}".format(timestamp, message)
@@ -64,9 +125,10 @@ class SSHClient:
         """Connect to the remote device"""
         self._log_with_timestamp("Connecting to {}:{}...".format(self._options.host, self._options.port), True)
 
-        # Create SSH client
+        # Create SSH client. Host keys are accepted without being recorded, neither the system
+        # nor the user known_hosts file is loaded so there is nothing to look them up in
         self._ssh_client = paramiko.SSHClient()
-        self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._ssh_client.set_missing_host_key_policy(paramiko.MissingHostKeyPolicy())
 
         try:
             self._ssh_client.connect(
@@ -78,6 +140,7 @@ class SSHClient:
                 allow_agent=False,
                 look_for_keys=False
             )
+            self._transport = self._ssh_client.get_transport()
 
             self._log_with_timestamp("Connected to {}:{}".format(self._options.host, self._options.port), True)
 
@@ -93,6 +156,7 @@ class SSHClient:
                     self._log_with_timestamp("Consider setting a prompt pattern for proper command handling.", True)
         except Exception as e:
             self._log_with_timestamp("Connection error: {}".format(str(e)), True)
+            self._flush_log()
             raise
 
     def find_prompt(self, attempt_count=5, timeout=5):
@@ -113,14 +177,13 @@ class SSHClient:
         self._log_with_timestamp("Attempting to auto-detect command prompt pattern...", True)
 
         # Clear any existing data in the buffer
-        self._output_buffer = StringIO()
-        buffer = ""
+        self._output_chunks = []
 
-        # First clear any pending data
+        # First clear any pending data, only the response to the newline below is inspected
+        # so it is dropped without being decoded
         while self._shell.recv_ready():
             try:
-                data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                buffer += data
+                self._drain()
             except Exception as e:
                 self._log_with_timestamp(f"Error clearing buffer: {str(e)}")
 
@@ -132,20 +195,24 @@ class SSHClient:
         time.sleep(3)  # Increase wait time to ensure full response
 
         # Collect all available output
-        buffer = ""
-        start_time = time.time()
-        while time.time() - start_time < 3:  # Short timeout for initial response
-            if self._shell.recv_ready():
-                try:
-                    data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                    buffer += data
-                    self._output_buffer.write(data)
-                except Exception as e:
-                    self._log_with_timestamp(f"Error reading from shell: {str(e)}")
-            else:
-                time.sleep(0.1)
+        chunks = []
+        start_time = time.monotonic()
+        while True:
+            remaining = 3 - (time.monotonic() - start_time)  # Short timeout for initial response
+            if remaining <= 0 or not self._wait_for_data(remaining):
+                break
+            try:
+                chunk = self._drain()
+                if not chunk:
+                    break  # Channel closed
+                chunks.append(chunk)
+                if self._options.capture_output:
+                    self._output_chunks.append(chunk)
+            except Exception as e:
+                self._log_with_timestamp(f"Error reading from shell: {str(e)}")
 
         # Process the buffer to extract a clean prompt
+        buffer = b"".join(chunks).decode('utf-8', errors='replace')
         prompt = self._extract_clean_prompt(buffer)
         if prompt:
             self._log_with_timestamp(f"Detected prompt from initial attempt: '{prompt}'", True)
@@ -156,36 +223,41 @@ class SSHClient:
             self._log_with_timestamp(f"Sending single newline (attempt {i + 1}/{attempt_count})")
 
             # Clear buffer for this attempt
-            buffer = ""
+            chunks = []
 
             # Send just one newline to avoid multiple prompt repetitions
             self._shell.send("\n")
 
             # Collect response
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                if self._shell.recv_ready():
+            start_time = time.monotonic()
+            while True:
+                remaining = timeout - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    break
+
+                # Wait briefly for more data, processing what we have once it stops coming
+                if self._wait_for_data(min(remaining, 0.1)):
                     try:
-                        data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                        buffer += data
-                        self._output_buffer.write(data)
-                        self._options.output_callback(data)
+                        chunk = self._drain()
+                        if not chunk:
+                            break  # Channel closed
+                        chunks.append(chunk)
+                        self._record_output(chunk)
                     except Exception as e:
                         self._log_with_timestamp(f"Error reading from shell: {str(e)}")
                         continue
                 else:
                     # If we got some data and no more is coming, process it
-                    if buffer:
+                    if chunks:
+                        buffer = b"".join(chunks).decode('utf-8', errors='replace')
                         prompt = self._extract_clean_prompt(buffer)
                         if prompt:
                             self._log_with_timestamp(f"Detected prompt: '{prompt}'", True)
                             return prompt
 
-                    # Small pause to prevent CPU spinning
-                    time.sleep(0.1)
-
             # If timeout occurred but we have buffer data, try to extract prompt
-            if buffer:
+            if chunks:
+                buffer = b"".join(chunks).decode('utf-8', errors='replace')
                 prompt = self._extract_clean_prompt(buffer)
                 if prompt:
                     self._log_with_timestamp(f"Extracted prompt (timeout): '{prompt}'", True)
@@ -199,20 +271,24 @@ class SSHClient:
         time.sleep(2)
 
         # Collect response
-        buffer = ""
-        start_time = time.time()
-        while time.time() - start_time < 5:  # Longer timeout for command
-            if self._shell.recv_ready():
-                try:
-                    data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                    buffer += data
-                    self._output_buffer.write(data)
-                except Exception as e:
-                    self._log_with_timestamp(f"Error reading from shell: {str(e)}")
-            else:
-                time.sleep(0.1)
+        chunks = []
+        start_time = time.monotonic()
+        while True:
+            remaining = 5 - (time.monotonic() - start_time)  # Longer timeout for command
+            if remaining <= 0 or not self._wait_for_data(remaining):
+                break
+            try:
+                chunk = self._drain()
+                if not chunk:
+                    break  # Channel closed
+                chunks.append(chunk)
+                if self._options.capture_output:
+                    self._output_chunks.append(chunk)
+            except Exception as e:
+                self._log_with_timestamp(f"Error reading from shell: {str(e)}")
 
         # Extract prompt from command output
+        buffer = b"".join(chunks).decode('utf-8', errors='replace')
         prompt = self._extract_clean_prompt(buffer)
         if prompt:
             self._log_with_timestamp(f"Detected prompt from hostname command: '{prompt}'", True)
@@ -236,23 +312,15 @@ class SSHClient:
             return None
 
         # Remove ANSI escape sequences
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        clean_buffer = ansi_escape.sub('', buffer)
-
-        # Get non-empty lines
-        lines = [line.strip() for line in clean_buffer.split('\n') if line.strip()]
-        if not lines:
-            return None
+        clean_buffer = _ANSI_ESCAPE_RE.sub('', buffer)
 
         # Look for repeated patterns in the last line
-        last_line = lines[-1]
-
-        # Common prompt ending characters
-        common_endings = ['#', '>', '$', '%', ':', '~]', ']', '}', ')', '|']
+        last_line = _last_nonempty_line(clean_buffer)
+        if not last_line:
+            return None
 
         # First check if the last line is a simple prompt (no repetition)
-        if any(last_line.endswith(char) for char in common_endings) and len(last_line) < 30:
+        if last_line.endswith(_PROMPT_ENDINGS) and len(last_line) < 30:
             if not self._is_repeated_prompt(last_line):
                 return last_line
 
@@ -262,9 +330,12 @@ class SSHClient:
             self._log_with_timestamp(f"Extracted base prompt from repeated pattern: '{base_prompt}'")
             return base_prompt
 
+        # The last line alone wasn't enough, split the whole buffer for the deeper checks
+        lines = [line.strip() for line in clean_buffer.split('\n') if line.strip()]
+
         # If the last line doesn't have repetitions but looks like a prompt
         for line in reversed(lines):
-            if any(line.endswith(char) for char in common_endings):
+            if line.endswith(_PROMPT_ENDINGS):
                 base_prompt = self._extract_base_prompt(line)
                 if base_prompt:
                     return base_prompt
@@ -274,7 +345,7 @@ class SSHClient:
         for line in reversed(lines):
             # Check if line looks like a hostname or path with prompt char
             if len(line) < 50:  # Not too long
-                for ending in common_endings:
+                for ending in _PROMPT_ENDINGS:
                     if ending in line:
                         parts = line.split(ending)
                         # If there are multiple parts and the last isn't empty (like in 'device#')
@@ -286,15 +357,17 @@ class SSHClient:
                             return base + ending
 
         # If all else fails, just use the last line
-        return lines[-1]
+        return last_line
 
     def _is_repeated_prompt(self, text):
         """Check if text contains repeated prompt patterns."""
-        parts = re.split(r'[#>$%:]', text)
+        # Fewer than two prompt characters leaves at most two parts, which is rejected below
+        # without building anything else
+        parts = _REPEAT_SPLIT_RE.split(text)
         # If there are multiple parts with similar text, it's likely a repeated prompt
         if len(parts) > 2:
-            base_parts = [part.strip() for part in parts if part.strip()]
-            if len(base_parts) > 1 and len(set(base_parts)) == 1:
+            base_parts = [part for part in map(str.strip, parts) if part]
+            if len(base_parts) > 1 and base_parts.count(base_parts[0]) == len(base_parts):
                 return True
         return False
 
@@ -304,25 +377,28 @@ class SSHClient:
         Example: 'device# device# device#' -> 'device#'
         """
         # Find common ending characters
-        for char in ['#', '>', '$', '%', ':', '~]', ']', '}', ')', '|']:
-            if char in text:
-                # Split by the prompt character
-                parts = text.split(char)
-                if len(parts) > 1:
-                    # Check if the parts before the character look similar
-                    base_parts = [part.strip() for part in parts[:-1]]
-                    if base_parts and all(part == base_parts[0] for part in base_parts):
-                        # Found a repetition pattern, return just one instance
-                        return base_parts[0] + char
+        for char in _PROMPT_ENDINGS:
+            index = text.find(char)
+            if index < 0:
+                continue
+
+            base = text[:index].strip()
+            last_index = text.rfind(char)
+            if last_index == index:
+                # A single prompt character, the text before it is the whole pattern
+                return base + char
+
+            # Check if the parts between the characters match the first one
+            parts = text[index + len(char):last_index].split(char)
+            if all(part.strip() == base for part in parts):
+                # Found a repetition pattern, return just one instance
+                return base + char
 
         # Look for repeated whitespace-separated patterns
         parts = text.split()
         if len(parts) > 1:
             # Check for repeating segments
-            potential_prompts = []
-            for part in parts:
-                if any(part.endswith(char) for char in ['#', '>', '$', '%', ':', '~]', ']', '}', ')', '|']):
-                    potential_prompts.append(part)
+            potential_prompts = [part for part in parts if part.endswith(_PROMPT_ENDINGS)]
 
             # If we found multiple segments that look like prompts and they're identical
             if len(potential_prompts) > 1 and len(set(potential_prompts)) == 1:
@@ -340,19 +416,72 @@ class SSHClient:
         self._shell = self._ssh_client.invoke_shell()
         self._shell.settimeout(self._options.timeout)
 
-        # Wait for the shell to initialize properly
-        self._log_with_timestamp("SSHClient Message: Waiting for shell initialization (2000ms)")
-        time.sleep(2)
+        # The channel's fileno() becomes readable whenever data is buffered
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._shell.fileno(), selectors.EVENT_READ)
+
+        # Wait for the shell to initialize, reading the banner and first prompt as they arrive
+        # and moving on once the shell goes quiet rather than always sleeping the full time
+        self._log_with_timestamp(
+            "SSHClient Message: Waiting for shell initialization (up to {}ms)".format(_SHELL_INIT_TIMEOUT * 1000))
+        deadline = time.monotonic() + _SHELL_INIT_TIMEOUT
+        received = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self._wait_for_data(min(remaining, _SHELL_SETTLE_TIME) if received else remaining):
+                break
+
+            chunk = self._drain()
+            if not chunk:
+                break  # Channel closed
+            received = True
+            self._record_output(chunk)
+
+    def _drain(self):
+        """Read all data buffered on the shell channel, returns empty bytes once the channel is closed"""
+        chunk = self._shell.recv(_RECV_BYTES)
+        if not chunk:
+            return chunk
+
+        chunks = [chunk]
+        size = len(chunk)
+        while size < _MAX_DRAIN_BYTES and self._shell.recv_ready():
+            chunk = self._shell.recv(_RECV_BYTES)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks)
+
+    def _record_output(self, chunk):
+        """Keep a chunk of shell output and pass it to the output callback, when either is wanted"""
+        if self._options.capture_output:
+            self._output_chunks.append(chunk)
+        if self._options.output_callback is not None:
+            self._options.output_callback(chunk.decode('utf-8', errors='replace'))
+
+    def _wait_for_data(self, timeout):
+        """Block until the shell has data to read or timeout seconds pass, return True if data is ready"""
+        return bool(self._selector.select(timeout))
+
+    def execute_command(self, command, expect_prompt_count=1, expect_prompt_timeout=None):
+        """
+        Execute command on the remote device
 
-        # Read initial shell output
-        if self._shell.recv_ready():
-            data = self._shell.recv(4096).decode('utf-8', errors='replace')
-            self._output_buffer.write(data)
-            self._options.output_callback(data)
+        Args:
+            command (str): The command, in shell mode several commands separated by commas
+            expect_prompt_count (int): In shell mode, how many times the expect prompt has to be
+                seen before the output is complete. Only pass more than one when every command
+                leaves the prompt unchanged, a command like 'conf t' never produces its share
+            expect_prompt_timeout (int): Milliseconds to wait for the expect prompt, defaults
+                to the expect_prompt_timeout option
 
-    def execute_command(self, command):
-        """Execute command on the remote device"""
-        if not self._ssh_client or not self._ssh_client.get_transport() or not self._ssh_client.get_transport().is_active():
+        Returns:
+            str: The command output
+        """
+        if not self._transport or not self._transport.is_active():
             raise RuntimeError("SSH client is not connected")
 
         # Only warn if using shell mode with no prompt information
@@ -361,12 +490,12 @@ class SSHClient:
                 "WARNING: Executing shell command with no prompt pattern or expect prompt defined!", True)
 
         self._log_with_timestamp("SSHClient Message: Executing command: '{}'".format(command), True)
-        start_time = time.time()
+        start_time = time.monotonic()
 
         if self._options.invoke_shell:
             # Handle multiple comma-separated commands for shell mode
             commands = command.split(',')
-            result = self._execute_shell_commands(commands)
+            result = self._execute_shell_commands(commands, expect_prompt_count, expect_prompt_timeout)
         else:
             result = self._execute_direct_command(command)
 
@@ -376,7 +505,7 @@ class SSHClient:
                 "SSHClient Message: Waiting between commands: {}s".format(self._options.inter_command_time))
             time.sleep(self._options.inter_command_time)
 
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         self._log_with_timestamp("SSHClient Message: Command execution completed in {:.2f}ms".format(duration * 1000), True)
 
         return result
@@ -384,7 +513,7 @@ class SSHClient:
     def _execute_direct_command(self, command):
         """Execute command directly (non-interactive)"""
         self._log_with_timestamp("Using direct command execution mode")
-        start_time = time.time()
+        start_time = time.monotonic()
 
         stdin, stdout, stderr = self._ssh_client.exec_command(
             command,
@@ -394,10 +523,11 @@ class SSHClient:
         result = stdout.read().decode('utf-8', errors='replace')
         error = stderr.read().decode('utf-8', errors='replace')
 
-        execution_time = time.time() - start_time
+        execution_time = time.monotonic() - start_time
         self._log_with_timestamp("Command execution took {:.2f}ms".format(execution_time * 1000))
 
-        self._options.output_callback(result)
+        if self._options.output_callback is not None:
+            self._options.output_callback(result)
 
         if error:
             self._log_with_timestamp("Command produced error output: {}".format(error), True)
@@ -424,74 +554,65 @@ class SSHClient:
         # Multiple approaches to extract the actual prompt:
 
         # 1. Try to find the last line with a prompt character
-        lines = raw_prompt.strip().split('\n')
-        cleaned_lines = [line.strip() for line in lines if line.strip()]
-
-        # Look through lines in reverse to find the first one that looks like a prompt
-        for line in reversed(cleaned_lines):
+        # Look through lines in reverse to find the first one that looks like a prompt, lines are
+        # scanned from the end on demand so the usual case only ever touches the last one
+        for line in _nonempty_lines_reversed(raw_prompt):
             # Common prompt ending characters
-            if line.endswith('#') or line.endswith('>') or line.endswith('$') or line.endswith('%'):
+            if line.endswith(_SIMPLE_PROMPT_ENDINGS):
                 # Check if this is a simple prompt or contains a command
                 if ' ' in line:
                     # This might be a line with both command and prompt
                     # Try to extract just the prompt part
-                    parts = line.split()
+                    parts = line.rsplit(None, 1)
                     # If the last part ends with a prompt character, it might be the prompt
-                    if parts[-1][-1] in '#>$%':
+                    if parts[-1].endswith(_SIMPLE_PROMPT_ENDINGS):
                         self._log_with_timestamp(f"Extracted prompt from command line: '{parts[-1]}'")
                         return parts[-1]
 
                     # Otherwise, try to find the last occurrence of the prompt pattern
-                    prompt_chars = ['#', '>', '$', '%']
-                    for char in prompt_chars:
-                        if char in line:
-                            # Split by the prompt character and take the first part + the character
-                            prompt_parts = line.split(char)
-                            if len(prompt_parts) > 1:
-                                potential_prompt = prompt_parts[0] + char
-                                # Check if this looks like a valid prompt (not too long, no spaces at specific positions)
-                                if len(potential_prompt) < 30 and ' ' not in potential_prompt[-15:]:
-                                    self._log_with_timestamp(
-                                        f"Extracted prompt by character split: '{potential_prompt}'")
-                                    return potential_prompt
+                    for char in _SIMPLE_PROMPT_ENDINGS:
+                        index = line.find(char)
+                        if index >= 0:
+                            # Take everything up to and including the first prompt character
+                            potential_prompt = line[:index + 1]
+                            # Check if this looks like a valid prompt (not too long, no spaces at specific positions)
+                            if len(potential_prompt) < 30 and potential_prompt.rfind(' ', max(0, index - 14)) == -1:
+                                self._log_with_timestamp(
+                                    f"Extracted prompt by character split: '{potential_prompt}'")
+                                return potential_prompt
                 else:
                     # This looks like a clean prompt
                     self._log_with_timestamp(f"Found clean prompt line: '{line}'")
                     return line
 
         # 2. Fallback: Try regex extraction on the whole string
-        prompt_patterns = [
-            r'(\S+[#>$%])\s*$',  # Basic prompt at the end of the string
-            r'((?:[A-Za-z0-9_\-]+(?:\([^\)]+\))?)?[#>$%])\s*$',  # Handle context in parentheses like router(config)#
-            r'(\S+@\S+[#>$%])\s*$'  # username@host style prompts
-        ]
-
-        for pattern in prompt_patterns:
-            match = re.search(pattern, raw_prompt)
+        for pattern in _PROMPT_PATTERNS:
+            match = pattern.search(raw_prompt)
             if match:
                 extracted = match.group(1)
                 self._log_with_timestamp(f"Extracted prompt via regex: '{extracted}'")
                 return extracted
 
         # 3. Last resort: just return the last line if it's not too long
-        if cleaned_lines and len(cleaned_lines[-1]) < 50:  # Arbitrary length limit for sanity
-            self._log_with_timestamp(f"Using last line as prompt: '{cleaned_lines[-1]}'")
-            return cleaned_lines[-1]
+        last_line = _last_nonempty_line(raw_prompt)
+        if last_line and len(last_line) < 50:  # Arbitrary length limit for sanity
+            self._log_with_timestamp(f"Using last line as prompt: '{last_line}'")
+            return last_line
 
         # If all else fails, return the original but warn
         self._log_with_timestamp(f"WARNING: Could not scrub prompt, using as-is: '{raw_prompt}'", True)
         return raw_prompt
-    def _execute_shell_commands(self, commands):
+    def _execute_shell_commands(self, commands, expect_prompt_count=1, expect_prompt_timeout=None):
         """Execute commands in interactive shell mode"""
         self._log_with_timestamp("Using shell mode for command execution")
-        start_time = time.time()
+        start_time = time.monotonic()
 
         if not self._shell:
             self._log_with_timestamp("Shell stream not initialized, creating now")
             self._create_shell_stream()
 
         # Clear buffer and reset prompt detection flag
-        self._output_buffer = StringIO()
+        self._output_chunks = []
         self._prompt_detected = False
 
         try:
@@ -519,27 +640,37 @@ class SSHClient:
                 # If an expect prompt is set, wait for it with timeout
                 if self._options.expect_prompt:
                     self._log_with_timestamp("Waiting for expect prompt: '{}'".format(self._options.expect_prompt))
-                    timeout_ms = self._options.expect_prompt_timeout
-                    timeout_time = time.time() + timeout_ms / 1000
-
-                    # Read all available output
-                    buffer = ""
+                    timeout_ms = expect_prompt_timeout or self._options.expect_prompt_timeout
+                    timeout_time = time.monotonic() + timeout_ms / 1000
+
+                    # Read all available output until the prompt has been seen as often as the
+                    # caller expects. Prompts are counted in each new chunk plus the few bytes
+                    # before it that could hold the start of a prompt, instead of rescanning everything
+                    expect_prompt = self._options.expect_prompt.encode('utf-8')
+                    carry_length = len(expect_prompt) - 1
+                    carry = b""
+                    prompts_seen = 0
                     prompt_detected = False
+                    prompts_expected = expect_prompt_count
+
+                    while not prompt_detected:
+                        remaining = timeout_time - time.monotonic()
+                        if remaining <= 0 or not self._wait_for_data(remaining):
+                            break
+
+                        chunk = self._drain()
+                        if not chunk:
+                            break  # Channel closed
+                        self._record_output(chunk)
 
-                    while time.time() < timeout_time and not prompt_detected:
-                        if self._shell.recv_ready():
-                            data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                            buffer += data
-                            self._output_buffer.write(data)
-                            self._options.output_callback(data)
-
-                            if self._options.expect_prompt in buffer:
-                                prompt_detected = True
-                                self._log_with_timestamp("Expected prompt detected, command complete")
-                                break
-                        else:
-                            # Small sleep to prevent CPU spinning
-                            time.sleep(0.05)
+                        window = carry + chunk
+                        prompts_seen += window.count(expect_prompt)
+                        carry = window[-carry_length:] if carry_length else b""
+
+                        if prompts_seen >= prompts_expected:
+                            prompt_detected = True
+                            self._log_with_timestamp("Expected prompt detected, command complete")
+                            break
 
                     if not prompt_detected:
                         self._log_with_timestamp("Timed out waiting for expect prompt after {}ms".format(timeout_ms), True)
@@ -551,9 +682,8 @@ class SSHClient:
 
                     # Read any remaining data
                     while self._shell.recv_ready():
-                        data = self._shell.recv(4096).decode('utf-8', errors='replace')
-                        self._output_buffer.write(data)
-                        self._options.output_callback(data)
+                        chunk = self._drain()
+                        self._record_output(chunk)
 
                 self._log_with_timestamp("Shell command execution completed")
             else:
@@ -564,13 +694,14 @@ class SSHClient:
             self._log_with_timestamp(error_message, True)
 
             self._log_message(error_message)
+            self._flush_log()
             self._options.error_callback(error_message)
 
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         self._log_with_timestamp("Total shell command execution time: {:.2f}ms".format(total_time * 1000))
 
-        # Return the accumulated output buffer content
-        return self._output_buffer.getvalue()
+        # Decode the accumulated output once, a multi-byte character split across reads stays intact
+        return b"".join(self._output_chunks).decode('utf-8', errors='replace')
 
     def set_expect_prompt(self, prompt_string):
         """Set the expected prompt string"""
@@ -583,30 +714,48 @@ class SSHClient:
         self._log_with_timestamp("Disconnecting from device")
 
         try:
+            if self._selector:
+                self._selector.close()
+                self._selector = None
+
             if self._shell:
                 self._shell.close()
                 self._shell = None
 
             if self._ssh_client:
                 self._ssh_client.close()
+            self._transport = None
 
             self._log_with_timestamp("Successfully disconnected")
         except Exception as e:
             self._log_with_timestamp("Error during disconnect: {}".format(str(e)), True)
 
+        if self._log_handle:
+            self._log_handle.close()
+            self._log_handle = None
+
     def _log_message(self, message):
         """Log message to file if log file is specified"""
         if not self._options.log_file:
             return
 
         try:
-            # Ensure directory exists
-            log_dir = os.path.dirname(self._options.log_file)
-            if log_dir and not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-
-            with open(self._options.log_file, 'a') as f:
-                f.write(message + '\n')
-                f.flush()
+            if not self._log_handle:
+                # Ensure directory exists
+                log_dir = os.path.dirname(self._options.log_file)
+                if log_dir and not os.path.exists(log_dir):
+                    os.makedirs(log_dir)
+
+                self._log_handle = open(self._options.log_file, 'a', buffering=8192)
+
+            self._log_handle.write(message + '\n')
         except Exception as e:
-            self._options.error_callback("Error writing to log file: {}".format(str(e)))
\ No newline at end of file
+            self._options.error_callback("Error writing to log file: {}".format(str(e)))
+
+    def _flush_log(self):
+        """Flush buffered log messages to the log file"""
+        if self._log_handle:
+            try:
+                self._log_handle.flush()
+            except Exception as e:
+                self._options.error_callback("Error writing to log file: {}".format(str(e)))
\ No newline at end of file
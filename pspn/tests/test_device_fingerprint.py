@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_fingerprint import DeviceFingerprint
+
+
+class BatchExecuteTest(unittest.TestCase):
+    def setUp(self):
+        self.fingerprinter = DeviceFingerprint("test", 22, "user", "secret")
+        self.fingerprinter._device_info.detected_prompt = "R1#"
+        self.fingerprinter._paging_disabled = True
+        self.sent = []
+
+    def respond_with(self, responses):
+        """Answer each command sent through the SSH client from responses"""
+        ssh_client = self.fingerprinter._ssh_client
+
+        def execute_command(command, expect_prompt_count=1, expect_prompt_timeout=None):
+            self.sent.append((command, expect_prompt_count, expect_prompt_timeout))
+            output = "".join(responses[cmd] for cmd in command.split(','))
+            ssh_client._options.output_callback(output)
+            return output
+
+        ssh_client.execute_command = execute_command
+
+    def test_splits_output_after_each_prompt(self):
+        self.respond_with({
+            "show version": "show version\r\nCisco IOS Software\r\nR1#",
+            "show inventory": "show inventory\r\nNAME: \"Chassis\"\r\nR1#",
+        })
+
+        outputs = self.fingerprinter.safe_execute_commands_batch(["show version", "show inventory"])
+
+        self.assertEqual(outputs, ["show version\r\nCisco IOS Software\r\nR1#",
+                                   "show inventory\r\nNAME: \"Chassis\"\r\nR1#"])
+        self.assertEqual(self.sent, [("show version,show inventory", 2, 10000)])
+
+    def test_falls_back_to_serial_when_prompts_dont_match(self):
+        # The prompt shows up inside the first command's output
+        self.respond_with({
+            "show version": "show version\r\nbanner mentions R1# here\r\nR1#",
+            "show inventory": "show inventory\r\nNAME: \"Chassis\"\r\nR1#",
+        })
+
+        outputs = self.fingerprinter.safe_execute_commands_batch(["show version", "show inventory"])
+
+        self.assertEqual(outputs, ["show version\r\nbanner mentions R1# here\r\nR1#",
+                                   "show inventory\r\nNAME: \"Chassis\"\r\nR1#"])
+        self.assertEqual([command for command, _, _ in self.sent],
+                         ["show version,show inventory", "show version", "show inventory"])
+
+
+if __name__ == '__main__':
+    unittest.main()
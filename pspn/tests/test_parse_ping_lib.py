@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_ping_lib as ppl
+
+
+CISCO_PING = """R1#ping 10.0.0.1
+Type escape sequence to abort.
+Sending 5, 100-byte ICMP Echos to 10.0.0.1, timeout is 2 seconds:
+!!!!!
+Success rate is 100 percent (5/5), round-trip min/avg/max = 1/2/4 ms
+R1#"""
+
+
+class PingResultMappingTest(unittest.TestCase):
+    def setUp(self):
+        self.result = ppl.parse_ping_output(CISCO_PING, platform="cisco_ios")
+
+    def test_membership(self):
+        self.assertIn('packet_loss_percent', self.result)
+        self.assertIn('timestamp', self.result)
+        self.assertNotIn('loss', self.result)
+
+    def test_dict_conversion(self):
+        result_dict = dict(self.result)
+
+        self.assertEqual(list(result_dict), list(ppl.PingResult._KEYS))
+        self.assertEqual(result_dict['packets_sent'], 5)
+        self.assertEqual(result_dict['rtt_avg'], 2.0)
+        self.assertEqual(self.result, result_dict)
+        self.assertEqual(dict(self.result.items()), result_dict)
+
+    def test_get_and_item_access(self):
+        self.assertEqual(self.result.get('target_host'), '10.0.0.1')
+        self.assertIsNone(self.result.get('missing'))
+        self.assertEqual(len(self.result), len(ppl.PingResult._KEYS))
+
+        self.result['target_host'] = 'router'
+        self.assertEqual(self.result['target_host'], 'router')
+        with self.assertRaises(KeyError):
+            self.result['missing'] = 1
+
+    def test_json_round_trip(self):
+        round_tripped = json.loads(json.dumps(dict(self.result)))
+
+        self.assertEqual(round_tripped, self.result.to_dict())
+        self.assertTrue(round_tripped['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssh_client import SSHClient, SSHClientOptions
+
+
+class FakeChannel:
+    """Stands in for a paramiko shell channel, answering each command from a table"""
+
+    def __init__(self, responses, banner=""):
+        self._responses = responses
+        self._buffer = bytearray()
+        # The read end of a pipe makes the channel selectable like a real one
+        self._read_fd, self._write_fd = os.pipe()
+        self._feed(banner)
+
+    def _feed(self, text):
+        if not text:
+            return
+        if not self._buffer:
+            os.write(self._write_fd, b"x")
+        self._buffer.extend(text.encode('utf-8'))
+
+    def settimeout(self, timeout):
+        pass
+
+    def fileno(self):
+        return self._read_fd
+
+    def recv_ready(self):
+        return bool(self._buffer)
+
+    def recv(self, size):
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        if not self._buffer:
+            os.read(self._read_fd, 1)
+        return data
+
+    def send(self, data):
+        self._feed(self._responses.get(data.rstrip('\n'), ""))
+        return len(data)
+
+    def close(self):
+        if self._read_fd is not None:
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+            self._read_fd = self._write_fd = None
+
+
+class FakeParamikoClient:
+    """Stands in for paramiko.SSHClient, handing out a FakeChannel as the shell"""
+
+    def __init__(self, channel):
+        self._channel = channel
+        self._transport = mock.Mock()
+        self._transport.is_active.return_value = True
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, **kwargs):
+        pass
+
+    def get_transport(self):
+        return self._transport
+
+    def invoke_shell(self):
+        return self._channel
+
+    def close(self):
+        pass
+
+
+RESPONSES = {
+    "show clock": "show clock\r\n10:00:00.000 UTC\r\nR1#",
+    "show users": "show users\r\n* vty 0 admin\r\nR1#",
+    "conf t": "conf t\r\nEnter configuration commands, one per line.\r\nR1(config)#",
+}
+
+
+class ExecuteCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.channel = FakeChannel(RESPONSES, banner="Welcome\r\nR1#")
+        options = SSHClientOptions(host="test", username="user", password="secret", invoke_shell=True,
+                                   expect_prompt="R1#", inter_command_time=0, expect_prompt_timeout=2000)
+        options.output_callback = None
+        self.client = SSHClient(options)
+
+        with mock.patch('ssh_client.paramiko.SSHClient', return_value=FakeParamikoClient(self.channel)):
+            self.client.connect()
+
+    def tearDown(self):
+        self.client.disconnect()
+
+    def test_returns_at_first_prompt_by_default(self):
+        # 'conf t' changes the prompt, so only one 'R1#' ever arrives for the two commands
+        start_time = time.monotonic()
+        output = self.client.execute_command("show clock,conf t")
+        elapsed = time.monotonic() - start_time
+
+        self.assertLess(elapsed, 1.5)
+        self.assertIn("10:00:00.000 UTC", output)
+
+    def test_waits_for_expected_prompt_count(self):
+        output = self.client.execute_command("show clock,show users", expect_prompt_count=2)
+
+        self.assertEqual(output.count("R1#"), 2)
+        self.assertIn("10:00:00.000 UTC", output)
+        self.assertIn("* vty 0 admin", output)
+
+    def test_times_out_when_prompts_are_missing(self):
+        start_time = time.monotonic()
+        output = self.client.execute_command("show clock,conf t", expect_prompt_count=2,
+                                             expect_prompt_timeout=300)
+        elapsed = time.monotonic() - start_time
+
+        self.assertGreaterEqual(elapsed, 0.3)
+        self.assertIn("R1(config)#", output)
+
+
+if __name__ == '__main__':
+    unittest.main()